@@ -1,20 +1,70 @@
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from core.db import Base, engine
-from core.routes import blog_router, media_router, auth_router  # Import routers
+from fastapi.staticfiles import StaticFiles
+from core.config.settings import settings
+import core.db
+from core.db import Base
+from core.db.replicas import ReplicaRoutingMiddleware, replica_urls
+from core.routes import blog_router, media_router, auth_router, export_router, metrics_router  # Import routers
+from core.services.google import google_verifier
+from core.services.likes import like_buffer
+from core.services.storage import media_path
+from core.utils.metrics import MetricsMiddleware, mark_worker_dead
+from core.utils.query_stats import RequestTimingMiddleware
 
 
-Base.metadata.create_all(engine)
+if settings.SENTRY_DSN:
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+
+    sentry_sdk.init(dsn=settings.SENTRY_DSN, integrations=[FastApiIntegration()])
+
+# Serverless deploys migrate ahead of time instead of paying DDL round trips on every cold start
+if not settings.SERVERLESS:
+    Base.metadata.create_all(core.db.engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled outbound client shared by every login on this worker; serverless
+    # instances open it on their first login instead
+    if not settings.SERVERLESS:
+        await google_verifier.startup()
+    if settings.LIKE_WRITE_BEHIND:
+        await like_buffer.start()
+    # Probe read replicas in the background; serverless instances rely on
+    # the retry window after a failed read instead
+    replica_sets = [] if settings.SERVERLESS else core.db.replica_sets()
+    for replicas in replica_sets:
+        await replicas.start()
+    try:
+        yield
+    finally:
+        if settings.LIKE_WRITE_BEHIND:
+            # Drain buffered like toggles before the worker exits
+            await like_buffer.stop()
+        for replicas in replica_sets:
+            await replicas.stop()
+        await google_verifier.shutdown()
+        mark_worker_dead()
+
 
 app = FastAPI(
     title="Readre Blog API",
     description="api documentation for Readre",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
+if settings.REQUEST_TIMING_ENABLED:
+    app.add_middleware(RequestTimingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if replica_urls():
+    app.add_middleware(ReplicaRoutingMiddleware, pin_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
 origins = ["http://localhost:3000", "https://readre.vercel.app"]
 app.add_middleware(
     CORSMiddleware,
@@ -22,12 +72,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "X-Query-Count"],
 )
 
 
 app.include_router(blog_router)
 app.include_router(media_router)
 app.include_router(auth_router)
+app.include_router(export_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
+if settings.MEDIA_BACKEND == "local":
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    app.mount(media_path(), StaticFiles(directory=settings.MEDIA_ROOT), name="media")
 
 
 @app.get("/")
@@ -0,0 +1,172 @@
+"""Cold start cost of the app: import, startup and first requests.
+
+Every run is a fresh interpreter, as on a new serverless instance. Each
+child process measures:
+
+- ``import``: ``import app`` (module imports, engine setup, schema DDL)
+- ``startup``: the lifespan's startup half
+- ``first_request`` / ``second_request``: ``GET /blogs`` straight through
+  the ASGI interface, so the first one includes the database connect and
+  whatever was deferred to first use
+- ``spawn_to_response``: from launching the interpreter to the first
+  response, which is what a cold request waits for
+
+The ``default`` and ``serverless`` (``SERVERLESS=true``) profiles run
+against the same SQLite file. The schema is created up front, as a
+migrated deploy would have it. ``--importtime`` lists the slowest imports
+of one serverless run.
+
+    python -m benchmarks.cold_start --runs 10
+    python -m benchmarks.cold_start --runs 20 --output cold_start.json --baseline cold_start.json
+    python -m benchmarks.cold_start --importtime 15
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = {
+    "default": {},
+    "serverless": {"SERVERLESS": "true"},
+}
+PHASES = ("import", "startup", "first_request", "second_request", "spawn_to_response")
+
+
+async def asgi_get(app, path: str) -> int:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+    }, receive, send)
+    return messages[0]["status"]
+
+
+def child_setup():
+    from core.db import Base, engine
+    import core.models  # noqa: F401
+
+    Base.metadata.create_all(engine)
+
+
+def child_measure():
+    spawned = float(os.environ["COLD_START_SPAWNED"])
+    timings = {}
+
+    started = time.perf_counter()
+    from app import app
+    timings["import"] = time.perf_counter() - started
+
+    async def serve():
+        started = time.perf_counter()
+        async with app.router.lifespan_context(app):
+            timings["startup"] = time.perf_counter() - started
+            for phase in ("first_request", "second_request"):
+                started = time.perf_counter()
+                status = await asgi_get(app, "/blogs")
+                timings[phase] = time.perf_counter() - started
+                if phase == "first_request":
+                    timings["spawn_to_response"] = time.time() - spawned
+                if status != 200:
+                    raise RuntimeError(f"GET /blogs returned {status}")
+
+    asyncio.run(serve())
+    print(json.dumps({phase: value * 1000 for phase, value in timings.items()}))
+
+
+def spawn(mode: str, env: dict, *python_flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, **env, "COLD_START_SPAWNED": repr(time.time())}
+    return subprocess.run(
+        [sys.executable, *python_flags, "-m", "benchmarks.cold_start", "--child", mode],
+        env=env, capture_output=True, text=True, check=True
+    )
+
+
+def summarize(samples):
+    result = {}
+    for phase in PHASES:
+        values = sorted(sample[phase] for sample in samples)
+        result[phase] = {
+            "median_ms": round(statistics.median(values), 1),
+            "max_ms": round(values[-1], 1),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes per profile")
+    parser.add_argument("--database-url", help="Database to use instead of a temporary SQLite file")
+    parser.add_argument("--importtime", type=int, metavar="N", help="Show the N slowest imports of a serverless start")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--child", choices=("setup", "measure"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "setup":
+        return child_setup()
+    if args.child == "measure":
+        return child_measure()
+
+    workdir = tempfile.mkdtemp(prefix="readre-cold-")
+    env = {
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir}/cold.db",
+        "MEDIA_BACKEND": "local",
+        "MEDIA_ROOT": os.path.join(workdir, "media"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+        "GOOGLE_CLIENT_ID": os.environ.get("GOOGLE_CLIENT_ID", "benchmark"),
+    }
+    spawn("setup", env)
+
+    if args.importtime:
+        trace = spawn("measure", {**env, **PROFILES["serverless"]}, "-X", "importtime").stderr
+        rows = []
+        for line in trace.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, name = line.split("|")
+                if cumulative.strip().isdigit():
+                    rows.append((int(cumulative), name.rstrip()))
+        print("Slowest imports (cumulative):")
+        for cumulative, name in sorted(rows, reverse=True)[:args.importtime]:
+            print(f"{cumulative / 1000:9.1f}ms {name}")
+        return
+
+    results = {}
+    for profile, overrides in PROFILES.items():
+        samples = [json.loads(spawn("measure", {**env, **overrides}).stdout.splitlines()[-1]) for _ in range(args.runs)]
+        results[profile] = summarize(samples)
+        print(profile, "  ".join(f"{phase} {results[profile][phase]['median_ms']}ms" for phase in PHASES), file=sys.stderr)
+
+    report = {"runs": args.runs, "profiles": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print("\nChange in median against baseline:", file=sys.stderr)
+        for profile, phases in results.items():
+            before = baseline["profiles"].get(profile)
+            if before is None:
+                continue
+            changes = "  ".join(
+                f"{phase} {phases[phase]['median_ms'] - before[phase]['median_ms']:+.1f}ms" for phase in PHASES
+            )
+            print(f"{profile}: {changes}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
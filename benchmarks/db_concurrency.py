@@ -0,0 +1,143 @@
+"""Latency and throughput of handlers under a mix of slow and fast queries.
+
+Requests arrive at a fixed rate (open loop). A small share of them run a
+slow query that waits on the database, like a cold index scan or lock wait.
+The same arrival schedule is replayed three ways:
+
+- ``blocking``: sync Session called straight from ``async def`` (the old routes)
+- ``threadpool``: sync Session through ``core.db.run_db`` (DB_ASYNC=false)
+- ``asyncio``: AsyncSession through ``core.db.run_db`` (DB_ASYNC=true)
+
+Latency is measured from each request's scheduled arrival time. A slow
+query delays every queued request only in ``blocking`` mode.
+
+    python -m benchmarks.db_concurrency --rate 200 --duration 5
+    python -m benchmarks.db_concurrency --database-url postgresql://localhost/readre
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from core.db import async_database_url, run_db  # noqa: E402
+
+FAST = text("SELECT 1")
+POOL = dict(pool_size=5, max_overflow=10, pool_timeout=30)
+
+
+def slow_query(url: str, seconds: float):
+    if url.startswith("postgres"):
+        return text("SELECT pg_sleep(:s)").bindparams(s=seconds)
+    return text("SELECT sleep(:s)").bindparams(s=seconds)
+
+
+def install_sqlite_sleep(sync_engine):
+    # SQLite has no server-side wait; emulate pg_sleep with a SQL function
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, _):
+        dbapi_connection.create_function("sleep", 1, time.sleep)
+
+
+def execute(session, statement):
+    return session.execute(statement).scalar()
+
+
+async def handle(mode, factory, statement):
+    if mode == "blocking":
+        with factory() as session:
+            execute(session, statement)
+    elif mode == "threadpool":
+        session = factory()
+        try:
+            await run_db(session, execute, statement)
+        finally:
+            session.close()
+    else:
+        async with factory() as session:
+            await run_db(session, execute, statement)
+
+
+async def run_mode(mode, url, args, schedule):
+    if mode == "asyncio":
+        engine = create_async_engine(async_database_url(url), poolclass=AsyncAdaptedQueuePool, **POOL)
+        sync_engine = engine.sync_engine
+        factory = async_sessionmaker(engine)
+    else:
+        engine = sync_engine = create_engine(url, poolclass=QueuePool, **POOL)
+        factory = sessionmaker(engine)
+    if url.startswith("sqlite"):
+        install_sqlite_sleep(sync_engine)
+
+    slow = slow_query(url, args.slow_seconds)
+    latencies = {"fast": [], "slow": []}
+
+    async def request(arrival, is_slow):
+        await handle(mode, factory, slow if is_slow else FAST)
+        latencies["slow" if is_slow else "fast"].append(time.perf_counter() - arrival)
+
+    started = time.perf_counter()
+    tasks = []
+    for offset, is_slow in schedule:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(started + offset, is_slow)))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - started
+
+    if mode == "asyncio":
+        await engine.dispose()
+    else:
+        engine.dispose()
+
+    fast = sorted(latencies["fast"])
+    quantiles = statistics.quantiles(fast, n=100) if len(fast) > 1 else [0.0] * 99
+    return {
+        "mode": mode,
+        "requests_per_second": len(schedule) / wall,
+        "fast_p50_ms": quantiles[49] * 1000,
+        "fast_p99_ms": quantiles[98] * 1000,
+        "fast_max_ms": fast[-1] * 1000 if fast else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=200.0, help="arrivals per second")
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-seconds", type=float, default=0.1)
+    parser.add_argument("--modes", default="blocking,threadpool,asyncio")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    rng = random.Random(args.seed)
+    count = int(args.rate * args.duration)
+    schedule = [(i / args.rate, rng.random() < args.slow_ratio) for i in range(count)]
+
+    print(f"{count} requests at {args.rate:g}/s, {args.slow_ratio:.0%} waiting {args.slow_seconds * 1000:g}ms")
+    print(f"{'mode':<11} {'req/s':>8} {'fast p50':>10} {'fast p99':>10} {'fast max':>10}")
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(mode, url, args, schedule))
+        print(
+            f"{result['mode']:<11} {result['requests_per_second']:>8.1f} "
+            f"{result['fast_p50_ms']:>8.2f}ms {result['fast_p99_ms']:>8.2f}ms {result['fast_max_ms']:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
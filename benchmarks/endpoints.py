@@ -0,0 +1,324 @@
+"""Latency, throughput and query counts of every API route on seeded data.
+
+Boots ``app`` in-process against a fresh SQLite database (or an empty
+PostgreSQL one), seeds ``--posts`` blogs with ``--comments`` comments and
+``--likes`` likes each, then drives every route of ``blog_router``,
+``auth_router`` and ``media_router`` through httpx's ASGI transport. Each
+route gets ``--warmup`` unrecorded requests, then ``--requests`` timed ones,
+one at a time so query counts are exact. Reads run first, then writes, then
+deletes of what the writes created.
+
+Nothing leaves the machine: Google's userinfo endpoint is
+``benchmarks.google_stub`` mounted on the verifier's transport, and media is
+stored with the local backend instead of Cloudinary.
+
+Results are written as JSON with stable key order, so a committed baseline
+shows regressions as a plain diff; ``--baseline`` also prints the change
+per route. ``--check-budgets`` fails the run when any route issues more
+statements than ``core.utils.query_stats.QUERY_BUDGETS`` allows, so run it
+at a larger scale in CI to catch per-row queries.
+
+    python -m benchmarks.endpoints --output benchmarks/baselines/sqlite-small.json
+    python -m benchmarks.endpoints --posts 2000 --comments 50 --likes 20 --baseline benchmarks/baselines/sqlite-small.json
+    python -m benchmarks.endpoints --posts 1000 --comments 100 --requests 20 --check-budgets
+    python -m benchmarks.endpoints --database-url postgresql://localhost/readre_bench --db-async
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=20, help="Comments per post")
+    parser.add_argument("--likes", type=int, default=10, help="Likes per post, each from a different user")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per route")
+    parser.add_argument("--database-url", help="Empty database to use instead of a temporary SQLite file")
+    parser.add_argument("--db-async", action="store_true", help="Run the routes on the asyncio engine (DB_ASYNC)")
+    parser.add_argument("--only", help="Comma-separated route names to run")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--check-budgets", action="store_true",
+                        help="Exit 1 if a route issued more queries than its QUERY_BUDGETS entry")
+    return parser.parse_args()
+
+
+def configure(args):
+    # Settings and engines are built at import time, so this runs first
+    workdir = tempfile.mkdtemp(prefix="readre-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ["DB_ASYNC"] = "true" if args.db_async else "false"
+    os.environ["MEDIA_BACKEND"] = "local"
+    os.environ["MEDIA_ROOT"] = os.path.join(workdir, "media")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+
+
+def seed(args):
+    """Bulk-insert the fixture; returns the author's email and the blog slugs."""
+    from sqlalchemy import insert, select
+    from core.config.settings import settings
+    from core.db import SessionLocal
+    from core.models.blogs import Blog, Comment, Like
+    from core.models.users import User
+    from core.utils.text import count_words, make_excerpt, reading_time
+
+    start = datetime.utcnow() - timedelta(days=args.posts)
+    description = "Benchmark article body about python services and databases. " * 40
+    words = count_words(description)
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"email": f"bench{n}@example.com", "name": f"Bench {n}", "username": f"bench{n}"}
+            for n in range(args.likes + 1)
+        ])
+        user_ids = list(db.scalars(select(User.id).order_by(User.id)))
+        db.execute(insert(Blog), [
+            {
+                "title": f"Benchmark post {n}", "slug": f"benchmark-post-{n}", "description": description,
+                "excerpt": make_excerpt(description), "word_count": words,
+                "reading_time": reading_time(words, settings.READING_SPEED_WPM), "tag": "TECHNOLOGY",
+                "members_only": False, "image": "https://example.com/benchmark.png",
+                "date_added": start + timedelta(days=n), "date_last_updated": start + timedelta(days=n),
+                "user_id": user_ids[n % len(user_ids)], "likes_count": args.likes, "comments_count": args.comments,
+            }
+            for n in range(args.posts)
+        ])
+        blog_ids = list(db.scalars(select(Blog.id).order_by(Blog.id)))
+        for blog_id in blog_ids:
+            db.execute(insert(Comment), [
+                {"text": f"Comment {n}", "blog_id": blog_id, "user_id": user_ids[n % len(user_ids)],
+                 "author": f"bench{n % len(user_ids)}", "date_added": start + timedelta(minutes=n)}
+                for n in range(args.comments)
+            ])
+            if args.likes:
+                db.execute(insert(Like), [{"blog_id": blog_id, "user_id": user_id} for user_id in user_ids[1:]])
+        db.commit()
+        slugs = list(db.scalars(select(Blog.slug).order_by(Blog.id)))
+        first_comment = db.scalars(select(Comment.id).where(Comment.blog_id == blog_ids[0]).order_by(Comment.id)).first()
+    return "bench0@example.com", slugs, first_comment
+
+
+def png(n: int) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (n % 256, n // 256 % 256, 90)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def routes(email, slugs, comment_id):
+    """(name, handler, route, build) per route; `build(i, state)` returns request kwargs.
+
+    `state` carries values from one route's responses to later routes, such
+    as the blogs and comments the write routes created for the deletes.
+    """
+    from core.routes.auth import create_access_token
+
+    token = create_access_token({"sub": email})
+    # Most routes read the bearer header, some only the access_token cookie,
+    # and delete_blog takes it as a query parameter
+    auth = {"Authorization": f"Bearer {token}", "Cookie": f"access_token={token}"}
+    hot = slugs[-1]
+
+    def slug(i):
+        return slugs[i % len(slugs)]
+
+    return [
+        ("list_blogs", "get_blogs", "GET /blogs", lambda i, s: dict(method="GET", url="/blogs", params={"skip": i % 50})),
+        ("list_blogs_cursor", "get_blogs", "GET /blogs?cursor", lambda i, s: dict(method="GET", url="/blogs", params={"cursor": s["cursor"]})),
+        ("search_blogs", "get_blogs", "GET /blogs?search", lambda i, s: dict(method="GET", url="/blogs", params={"search": ("python", "databases", "services")[i % 3]})),
+        ("get_blog", "get_blog", "GET /blogs/{slug}", lambda i, s: dict(method="GET", url=f"/blogs/{slug(i)}")),
+        ("get_user_blogs", "get_user_blogs", "GET /user/blogs", lambda i, s: dict(method="GET", url="/user/blogs", headers=auth)),
+        ("get_comments", "get_comments", "GET /blogs/{slug}/comments", lambda i, s: dict(method="GET", url=f"/blogs/{slug(i)}/comments")),
+        ("get_like_status", "get_like_status", "GET /blogs/{slug}/like", lambda i, s: dict(method="GET", url=f"/blogs/{slug(i)}/like", headers=auth)),
+        ("auth_me", "get_current_user_info", "GET /auth/me", lambda i, s: dict(method="GET", url="/auth/me", headers=auth)),
+        ("auth_google", "google_auth", "POST /auth/google", lambda i, s: dict(method="POST", url="/auth/google", json={"token": f"bench{i % 50}.token{i}"})),
+        ("auth_refresh", "refresh_token", "POST /auth/refresh", lambda i, s: dict(method="POST", url="/auth/refresh", headers={"Cookie": f"refresh_token={s['refresh_token']}"})),
+        ("auth_logout", "logout", "POST /auth/logout", lambda i, s: dict(method="POST", url="/auth/logout")),
+        ("upload_image", "upload_image", "POST /upload-image", lambda i, s: dict(method="POST", url="/upload-image", files={"file": ("bench.png", png(i), "image/png")})),
+        ("upload_image_duplicate", "upload_image", "POST /upload-image (known content)", lambda i, s: dict(method="POST", url="/upload-image", files={"file": ("bench.png", png(0), "image/png")})),
+        ("get_image_variant", "get_image_variant", "GET /media/variants/{stem}/{file}", lambda i, s: dict(method="GET", url=s["variant_path"])),
+        ("create_blog", "create_blog", "POST /blogs", lambda i, s: dict(method="POST", url="/blogs", headers=auth, json={
+            "title": f"Created benchmark post {i}", "description": "Fresh benchmark content. " * 60,
+            "tag": "TECHNOLOGY", "image": "https://example.com/benchmark.png"})),
+        ("import_blogs", "import_blogs", "POST /blogs/import", lambda i, s: dict(method="POST", url="/blogs/import", headers=auth, content="".join(
+            json.dumps({"title": f"Imported benchmark post {i}-{n}", "description": "Imported content. " * 60,
+                        "tag": "TECHNOLOGY", "image": "https://example.com/benchmark.png"}) + "\n"
+            for n in range(10)))),
+        ("update_blog", "update_blog", "PUT /blogs/{slug}", lambda i, s: dict(method="PUT", url=f"/blogs/{s['created'][i % len(s['created'])]}", headers=auth, json={
+            "title": f"Created benchmark post {i % len(s['created'])}", "description": f"Edited benchmark content {i}. " * 60,
+            "tag": "TECHNOLOGY", "image": "https://example.com/benchmark.png"})),
+        ("create_comment", "create_comment", "POST /blogs/{slug}/comments", lambda i, s: dict(method="POST", url=f"/blogs/{hot}/comments", headers=auth, json={"text": f"Benchmark comment {i}"})),
+        ("update_comment", "update_comment", "PUT /blogs/{slug}/comments/{id}", lambda i, s: dict(method="PUT", url=f"/blogs/{hot}/comments/{s['comments'][i % len(s['comments'])]}", headers=auth, json={"text": f"Edited comment {i}"})),
+        ("like_blog", "like_blog", "POST /blogs/{slug}/like", lambda i, s: dict(method="POST", url=f"/blogs/{slug(i)}/like", headers=auth)),
+        ("like_comment", "like_comment", "POST /blogs/{slug}/comments/{id}/like", lambda i, s: dict(method="POST", url=f"/blogs/{slugs[0]}/comments/{comment_id}/like", headers=auth)),
+        ("delete_comment", "delete_comment", "DELETE /blogs/{slug}/comments/{id}", lambda i, s: dict(method="DELETE", url=f"/blogs/{hot}/comments/{s['comments'].pop()}", headers=auth)),
+        ("delete_blog", "delete_blog", "DELETE /blogs/{slug}", lambda i, s: dict(method="DELETE", url=f"/blogs/{s['created'].pop()}", params={"access_token": token})),
+    ]
+
+
+def remember(name, response, state):
+    """Pick the values later routes need out of a response."""
+    if response.status_code >= 400:
+        return
+    if name == "list_blogs" and response.headers.get("x-next-cursor"):
+        state["cursor"] = response.headers["x-next-cursor"]
+    elif name in ("auth_google", "auth_refresh") and response.cookies.get("refresh_token"):
+        state["refresh_token"] = response.cookies["refresh_token"]
+    elif name == "upload_image":
+        from core.services.storage import storage
+
+        state["variant_path"] = urlsplit(storage.variant_url(response.json()["image_url"], "card", "webp")).path
+    elif name == "create_blog":
+        state["created"].append(response.json()["slug"])
+    elif name == "create_comment":
+        state["comments"].append(response.json()["id"])
+
+
+def summarize(route, latencies, queries, statuses):
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "route": route,
+        "requests": len(latencies),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "throughput_rps": round(len(latencies) / sum(latencies), 1),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "max_queries": max(queries),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run(args, email, slugs, comment_id):
+    import httpx
+    from sqlalchemy import event
+    from app import app
+    from benchmarks import google_stub
+    from core.db import async_engine, engine
+    from core.services.google import google_verifier
+
+    queries = [0]
+
+    def count(*_):
+        queries[0] += 1
+
+    for target in filter(None, (engine, async_engine and async_engine.sync_engine)):
+        event.listen(target, "before_cursor_execute", count)
+
+    google_verifier._transport = httpx.ASGITransport(app=google_stub.app)
+    selected = set(args.only.split(",")) if args.only else None
+    state = {"cursor": None, "refresh_token": "", "variant_path": "", "created": [], "comments": []}
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            for name, handler, route, build in routes(email, slugs, comment_id):
+                if selected and name not in selected:
+                    continue
+                latencies, counts, statuses = [], [], {}
+                for i in range(args.warmup + args.requests):
+                    kwargs = build(i, state)
+                    client.cookies.clear()
+                    queries[0] = 0
+                    started = time.perf_counter()
+                    # The routes print diagnostics on every request
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        response = await client.request(**kwargs)
+                    elapsed = time.perf_counter() - started
+                    remember(name, response, state)
+                    if i < args.warmup:
+                        continue
+                    latencies.append(elapsed)
+                    counts.append(queries[0])
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                results[name] = summarize(route, latencies, counts, statuses)
+                results[name]["handler"] = handler
+                print(format_row(name, results[name]), file=sys.stderr)
+    if async_engine is not None:
+        # aiosqlite connections hold non-daemon threads that block exit
+        await async_engine.dispose()
+    return results
+
+
+def format_row(name, result):
+    return (f"{name:<24} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+            f"p99 {result['p99_ms']:>8.2f}ms  {result['throughput_rps']:>8.1f} req/s  "
+            f"{result['queries_per_request']:>6.2f} queries  {result['statuses']}")
+
+
+def compare(results, baseline):
+    print("\nChange against baseline (p50, p95, queries per request):", file=sys.stderr)
+    for name, result in results.items():
+        before = baseline["routes"].get(name)
+        if before is None:
+            print(f"{name:<24} new", file=sys.stderr)
+            continue
+        deltas = [
+            f"{(result[key] - before[key]) / before[key] * 100:+7.1f}%" if before[key] else "    n/a"
+            for key in ("p50_ms", "p95_ms")
+        ]
+        queries = result["queries_per_request"] - before["queries_per_request"]
+        flag = "  <- more queries" if queries > 0 else ""
+        print(f"{name:<24} {deltas[0]}  {deltas[1]}  {queries:+6.2f}{flag}", file=sys.stderr)
+
+
+def over_budget(results):
+    from core.utils.query_stats import assert_query_budget
+
+    failures = []
+    for name, result in results.items():
+        try:
+            assert_query_budget(result["handler"], result["max_queries"])
+        except AssertionError as e:
+            failures.append(f"{name}: {e}")
+    return failures
+
+
+def main():
+    args = parse_args()
+    configure(args)
+    import app  # noqa: F401  creates the tables
+    email, slugs, comment_id = seed(args)
+    results = asyncio.run(run(args, email, slugs, comment_id))
+
+    from sqlalchemy.engine import make_url
+
+    report = {
+        "database": make_url(os.environ["DATABASE_URL"]).get_backend_name(),
+        "db_async": args.db_async,
+        "scale": {"posts": args.posts, "comments_per_post": args.comments, "likes_per_post": args.likes},
+        "requests_per_route": args.requests,
+        "warmup_per_route": args.warmup,
+        "routes": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    if args.check_budgets:
+        failures = over_budget(results)
+        for failure in failures:
+            print(f"Over query budget: {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Local stand-in for Google's OAuth userinfo endpoint.
+
+Any access token is accepted and mapped to a deterministic user; tokens
+starting with ``invalid`` are rejected with 401. Point the API at it with
+``GOOGLE_USERINFO_URL=http://127.0.0.1:8765/oauth2/v3/userinfo``.
+
+    python -m benchmarks.google_stub --port 8765 --latency-ms 80
+"""
+import argparse
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LATENCY_SECONDS = 0.0
+
+
+def userinfo_for(token: str) -> dict:
+    name = token.split(".")[0][:32] or "user"
+    return {
+        "sub": name,
+        "email": f"{name}@example.com",
+        "name": name.title(),
+        "picture": f"https://example.com/{name}.png",
+    }
+
+
+async def userinfo(request: Request):
+    token = request.query_params.get("access_token", "")
+    if LATENCY_SECONDS:
+        await asyncio.sleep(LATENCY_SECONDS)
+    if not token or token.startswith("invalid"):
+        return JSONResponse({"error": "invalid_request"}, status_code=401)
+    return JSONResponse(userinfo_for(token))
+
+
+app = Starlette(routes=[Route("/oauth2/v3/userinfo", userinfo)])
+
+
+def main():
+    global LATENCY_SECONDS
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    LATENCY_SECONDS = args.latency_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
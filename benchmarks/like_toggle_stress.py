@@ -0,0 +1,200 @@
+"""Concurrent like toggles against the unique like indexes.
+
+Worker threads hammer a handful of (user, target) pairs with toggles, each
+in its own transaction, then the database is checked for duplicate likes
+and for counters that disagree with the like rows.
+
+- ``statement``: ``core.services.likes.toggle_like`` (single statement on
+  PostgreSQL; DELETE/INSERT ... RETURNING on SQLite)
+- ``legacy``: the old select-then-insert toggle, for comparison; with the
+  indexes in place its races surface as IntegrityErrors instead of
+  duplicate rows, and racing unlikes still drive the counters off
+- ``write-behind``: ``toggle_like_buffered`` from concurrent tasks while
+  the buffer flushes every ``--flush-interval`` seconds. After the buffer
+  is stopped (which drains it) the counters must match the like rows, and
+  the counts the last toggles returned must match both
+
+    python -m benchmarks.like_toggle_stress --threads 16 --toggles 200
+    python -m benchmarks.like_toggle_stress --database-url postgresql://localhost/readre_stress
+    python -m benchmarks.like_toggle_stress --mode write-behind --flush-interval 0.01
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import core.db  # noqa: E402
+from core.db import Base  # noqa: E402
+from core.models.blogs import Blog, Comment, Like  # noqa: E402
+from core.models.users import User  # noqa: E402
+from core.services.blogs import adjust_counter  # noqa: E402
+from core.services.likes import like_buffer, toggle_like, toggle_like_buffered  # noqa: E402
+
+
+def legacy_toggle(db, user_id, column, target_id, blog_id):
+    counter = Blog.likes_count if column is Like.blog_id else Comment.likes_count
+    like = db.scalars(select(Like).where(Like.user_id == user_id, column == target_id)).first()
+    if like:
+        db.delete(like)
+        return False, adjust_counter(db, counter, target_id, -1)
+    db.add(Like(user_id=user_id, **{column.key: target_id}))
+    db.flush()
+    return True, adjust_counter(db, counter, target_id, 1)
+
+
+def seed(factory, users):
+    # Tagged per run, so repeated runs against one --database-url do not collide
+    run = uuid.uuid4().hex[:8]
+    with factory() as db:
+        seeded = [User(email=f"stress{i}-{run}@example.com", name=f"Stress {i} {run}") for i in range(users)]
+        db.add_all(seeded)
+        db.flush()
+        author = seeded[0].id
+        blog = Blog(title=f"Stress test blog post {run}", description="word " * 40, tag="TECHNOLOGY",
+                    image="https://example.com/a.png", user_id=author)
+        db.add(blog)
+        db.flush()
+        comment = Comment(text="stress", user_id=author, blog_id=blog.id, author="stress")
+        db.add(comment)
+        db.commit()
+        return [user.id for user in seeded], blog.id, comment.id, blog.slug
+
+
+def worker(factory, toggle, pairs, toggles, outcome, lock):
+    local = {"ok": 0, "conflicts": 0, "retries": 0}
+    for _ in range(toggles):
+        user_id, column, target_id, blog_id = random.choice(pairs)
+        while True:
+            db = factory()
+            try:
+                toggle(db, user_id, column, target_id, blog_id)
+                db.commit()
+                local["ok"] += 1
+                break
+            except IntegrityError:
+                db.rollback()
+                local["conflicts"] += 1
+                break
+            except OperationalError:
+                # SQLite "database is locked" under heavy write contention
+                db.rollback()
+                local["retries"] += 1
+            finally:
+                db.close()
+    with lock:
+        for key, value in local.items():
+            outcome[key] += value
+
+
+async def write_behind(factory, pairs, slug, tasks, toggles, outcome):
+    """Toggle through the buffer from `tasks` coroutines; returns the last count seen per target."""
+    last = {}
+
+    async def run():
+        for _ in range(toggles):
+            user_id, column, target_id, _ = random.choice(pairs)
+            comment_id = target_id if column is Like.comment_id else None
+            db = factory()
+            try:
+                _, likes_count = await toggle_like_buffered(db, user_id, slug, comment_id)
+            finally:
+                db.close()
+            last[column.key] = likes_count
+            outcome["ok"] += 1
+
+    await like_buffer.start()
+    try:
+        await asyncio.gather(*(run() for _ in range(tasks)))
+    finally:
+        await like_buffer.stop()
+    outcome["flushes"] = like_buffer.stats()["flushes"]
+    return last
+
+
+def check(factory, blog_id, comment_id):
+    with factory() as db:
+        duplicates = 0
+        for column in (Like.blog_id, Like.comment_id):
+            duplicates += db.scalar(
+                select(func.count()).select_from(
+                    select(Like.user_id, column).where(column.isnot(None))
+                    .group_by(Like.user_id, column).having(func.count() > 1).subquery()
+                )
+            )
+        blog_rows = db.scalar(select(func.count()).where(Like.blog_id == blog_id))
+        comment_rows = db.scalar(select(func.count()).where(Like.comment_id == comment_id))
+        blog_counter = db.scalar(select(Blog.likes_count).where(Blog.id == blog_id))
+        comment_counter = db.scalar(select(Comment.likes_count).where(Comment.id == comment_id))
+    return duplicates, (blog_counter, blog_rows), (comment_counter, comment_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Empty database to use (default: a temporary SQLite file)")
+    parser.add_argument("--mode", choices=["statement", "legacy", "write-behind"], default="statement")
+    parser.add_argument("--threads", type=int, default=16, help="Threads, or asyncio tasks with --mode write-behind")
+    parser.add_argument("--toggles", type=int, default=200, help="Toggles per thread")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--flush-interval", type=float, default=0.01, help="Like buffer flush interval (write-behind)")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/stress.db"
+    connect_args = {"timeout": 30} if url.startswith("sqlite") else {}
+    engine = create_engine(url, pool_size=args.threads, max_overflow=0, connect_args=connect_args)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(engine)
+    # The like buffer flushes through core.db's own sessions; point them here
+    core.db.DATABASE_URL = url
+    like_buffer.flush_interval = args.flush_interval
+
+    users, blog_id, comment_id, slug = seed(factory, args.users)
+    pairs = [(user_id, Like.blog_id, blog_id, blog_id) for user_id in users]
+    pairs += [(user_id, Like.comment_id, comment_id, blog_id) for user_id in users]
+    toggle = toggle_like if args.mode == "statement" else legacy_toggle
+
+    outcome = {"ok": 0, "conflicts": 0, "retries": 0}
+    last = None
+    started = time.perf_counter()
+    if args.mode == "write-behind":
+        last = asyncio.run(write_behind(factory, pairs, slug, args.threads, args.toggles, outcome))
+    else:
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=worker, args=(factory, toggle, pairs, args.toggles, outcome, lock))
+            for _ in range(args.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    duplicates, blog, comment = check(factory, blog_id, comment_id)
+    total = args.threads * args.toggles
+    print(f"{args.mode}: {total} toggles in {elapsed:.2f}s ({total / elapsed:.0f}/s) on {engine.dialect.name}")
+    print(f"  committed {outcome['ok']}, unique-index conflicts {outcome['conflicts']}, lock retries {outcome['retries']}")
+    print(f"  duplicate likes: {duplicates}")
+    print(f"  blog counter {blog[0]} vs rows {blog[1]}, comment counter {comment[0]} vs rows {comment[1]}")
+    consistent = duplicates == 0 and blog[0] == blog[1] and comment[0] == comment[1]
+    if last is not None:
+        # The final toggle of each target returned what the drained buffer wrote
+        print(f"  flushes {outcome['flushes']}, last returned counts: blog {last.get('blog_id')}, comment {last.get('comment_id')}")
+        consistent = consistent and last.get("blog_id", blog[0]) == blog[0] and last.get("comment_id", comment[0]) == comment[0]
+    print("  consistent" if consistent else "  INCONSISTENT")
+    raise SystemExit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
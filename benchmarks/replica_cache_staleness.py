@@ -0,0 +1,127 @@
+"""Read-your-writes through the response cache with a lagging replica.
+
+Boots ``app`` in-process with two SQLite files, a primary and a "replica"
+that only catches up when this script copies the primary over it, so the
+lag is exact. Then:
+
+1. the writer updates a blog, which pins it to the primary for ``--pin``
+   seconds;
+2. an anonymous reader fetches the blog from the replica, which has not
+   caught up, and refills the response cache with the old version;
+3. the replica catches up, the pin lapses, and the writer reads the blog.
+
+The writer must see its own edit: the entry filled from the lagging
+replica must have expired with the pin, not live for the cache TTL.
+Exits 1 otherwise.
+
+    python -m benchmarks.replica_cache_staleness
+    python -m benchmarks.replica_cache_staleness --pin 2 --db-async
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pin", type=int, default=1, help="READ_YOUR_WRITES_SECONDS")
+    parser.add_argument("--db-async", action="store_true", help="Run the routes on the asyncio engine (DB_ASYNC)")
+    return parser.parse_args()
+
+
+def configure(args):
+    # Settings and engines are built at import time, so this runs first
+    workdir = tempfile.mkdtemp(prefix="readre-replica-")
+    paths = {name: os.path.join(workdir, f"{name}.db") for name in ("primary", "replica")}
+    os.environ["DATABASE_URL"] = f"sqlite:///{paths['primary']}"
+    os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{paths['replica']}"
+    os.environ["READ_YOUR_WRITES_SECONDS"] = str(args.pin)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "true"
+    os.environ["DB_ASYNC"] = "true" if args.db_async else "false"
+    os.environ["MEDIA_BACKEND"] = "local"
+    os.environ["MEDIA_ROOT"] = os.path.join(workdir, "media")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+    return paths
+
+
+def catch_up(paths):
+    """Replicate: copy the primary over the replica."""
+    with sqlite3.connect(paths["primary"]) as primary, sqlite3.connect(paths["replica"]) as replica:
+        primary.backup(replica)
+
+
+def seed():
+    from core.db import SessionLocal
+    from core.models.blogs import Blog
+    from core.models.users import User
+
+    with SessionLocal() as db:
+        user = User(email="writer@example.com", name="Writer")
+        db.add(user)
+        db.flush()
+        blog = Blog(title="Replica lag check post", description="Original description. " * 5, tag="TECHNOLOGY",
+                    image="https://example.com/a.png", user_id=user.id)
+        db.add(blog)
+        db.commit()
+        return user.email, blog.slug, blog.title
+
+
+async def run(args, paths, email, slug, title):
+    import httpx
+    import core.db
+    from app import app
+    from core.routes.auth import create_access_token
+
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    edited = "Edited description. " * 5
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as writer, \
+                httpx.AsyncClient(transport=transport, base_url="http://testserver") as reader:
+            # Warm the cache with the current version
+            await reader.get(f"/blogs/{slug}")
+
+            response = await writer.put(f"/blogs/{slug}", headers=auth, json={
+                "title": title, "description": edited, "tag": "TECHNOLOGY", "image": "https://example.com/a.png"})
+            response.raise_for_status()
+
+            # The replica has not replayed the edit; this refills the cache
+            refill = await reader.get(f"/blogs/{slug}")
+
+            catch_up(paths)
+            await asyncio.sleep(args.pin + 0.5)
+            after = await writer.get(f"/blogs/{slug}", headers=auth)
+
+    if core.db.async_engine is not None:
+        # aiosqlite connections hold non-daemon threads that block exit
+        await core.db.async_engine.dispose()
+        for replicas in core.db.replica_sets():
+            for replica in replicas.replicas:
+                if replica.async_engine is not None:
+                    await replica.async_engine.dispose()
+
+    for label, response in (("reader during lag", refill), ("writer after pin", after)):
+        state = "edited" if response.json()["description"] == edited else "stale"
+        print(f"{label:<18} {state:<7} X-Cache {response.headers.get('x-cache', '-')}")
+    return after.json()["description"] == edited
+
+
+def main():
+    args = parse_args()
+    paths = configure(args)
+    # Importing the app creates the schema on the primary
+    import app  # noqa: F401
+
+    email, slug, title = seed()
+    catch_up(paths)
+    consistent = asyncio.run(run(args, paths, email, slug, title))
+    print("consistent" if consistent else "INCONSISTENT: the writer was served a pre-write response")
+    sys.exit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,29 @@
 from pydantic_settings import BaseSettings
 import os
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # Database configuration
     # DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./blog.db")
     DATABASE_URL: str 
+    # Use the asyncio engine (asyncpg / aiosqlite) for request sessions
+    DB_ASYNC: bool = False
+    # "queue" (pooled per process) or "null" (connect per checkout, for external
+    # poolers); defaults to "null" when SERVERLESS
+    DB_POOL: Optional[str] = None
+    # Comma-separated read replica URLs. GET/HEAD requests read from them
+    # round-robin; writes, and a client's reads for READ_YOUR_WRITES_SECONDS
+    # after its own write, use DATABASE_URL. A replica that fails is skipped
+    # for REPLICA_HEALTH_CHECK_SECONDS, which is also the probe interval
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Serverless profile: no schema DDL at import (run `alembic upgrade head`
+    # on deploy) and no long-lived connection pool
+    SERVERLESS: bool = False
+    # Error reporting; sentry_sdk is only imported when a DSN is set
+    SENTRY_DSN: Optional[str] = None
     
     # Convert postgres:// to postgresql:// for SQLAlchemy 1.4+
     # @property
@@ -22,6 +40,73 @@ class Settings(BaseSettings):
     COOKIE_DOMAIN: Optional[str] = None
     IS_PRODUCTION: bool = False
 
+    # Google token verification
+    GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v3/userinfo"
+    GOOGLE_HTTP_TIMEOUT_SECONDS: float = 5.0
+    GOOGLE_MAX_CONCURRENCY: int = 20
+    GOOGLE_TOKEN_CACHE_TTL_SECONDS: int = 60
+    GOOGLE_TOKEN_CACHE_SIZE: int = 10_000
+
+    # Verified access-token claims and current-user rows, per worker
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000
+    AUTH_USER_CACHE_SIZE: int = 10_000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+
+    # Image uploads: "cloudinary" or "local" (files under MEDIA_ROOT served at MEDIA_URL)
+    MEDIA_BACKEND: str = "cloudinary"
+    MEDIA_ROOT: str = "media"
+    MEDIA_URL: str = "http://localhost:8000/media/"
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 64 * 1024
+    MAX_CONCURRENT_UPLOADS: int = 4
+    IMAGE_VARIANT_QUALITY: int = 80
+    # Unreferenced uploads younger than this survive `manage.py gc-uploads`
+    UPLOAD_GC_GRACE_HOURS: int = 24
+
+    # NDJSON blog import: rows per INSERT batch, and per-line errors kept in the report
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    # Larger bodies, or any longer line, are rejected with 413 while streaming
+    IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+
+    # Full-content export; disabled until a token is set
+    EXPORT_TOKEN: Optional[str] = None
+    EXPORT_BATCH_SIZE: int = 1000
+    # Incremental watermarks lag this far behind the export, covering rows
+    # still being committed (and clock skew between workers)
+    EXPORT_WATERMARK_LAG_SECONDS: int = 60
+
+    # Write-behind like toggles: applied in memory, flushed in batches
+    LIKE_WRITE_BEHIND: bool = False
+    LIKE_BUFFER_FLUSH_SECONDS: float = 1.0
+    LIKE_BUFFER_MAX_PENDING: int = 500
+
+    # Server-Timing / X-Query-Count headers and a JSON log line per request
+    REQUEST_TIMING_ENABLED: bool = True
+
+    # Prometheus /metrics; requires `Authorization: Bearer <METRICS_TOKEN>` when a token is set.
+    # In production the endpoint answers 404 until METRICS_TOKEN is set
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+
+    # Words per minute used for the stored reading time of each blog
+    READING_SPEED_WPM: int = 200
+
+    # Response cache for anonymous blog reads
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+
+    # Cache-Control policy per read route (keyed by handler name)
+    CACHE_CONTROL: Dict[str, str] = {
+        "get_blogs": "public, max-age=30",
+        "get_blog": "public, max-age=0, must-revalidate",
+        "get_comments": "public, max-age=0, must-revalidate",
+        "get_like_status": "no-cache",
+    }
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,34 +1,167 @@
-from typing import Annotated
+from typing import Annotated, Union
 from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import os
-from sqlalchemy.pool import QueuePool
+import threading
+from sqlalchemy.pool import NullPool
+from core.config.settings import settings
+from core.db.replicas import Replica, ReplicaSet, RoutingSession, replica_urls
+from core.utils.metrics import MeteredAsyncAdaptedQueuePool, MeteredQueuePool
+from core.utils.query_stats import instrument_engine
 
 # Get the DATABASE_URL from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Create engine with correct parameters for Supabase
-engine = create_engine(
-    DATABASE_URL,
-    poolclass=QueuePool,
+POOL_OPTIONS = dict(
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
     pool_timeout=30
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    driver = {
+        "postgres": "postgresql+asyncpg",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+        "sqlite+pysqlite": "sqlite+aiosqlite",
+    }.get(scheme, scheme)
+    return f"{driver}{sep}{rest}"
+
+
+def pool_options(metered_pool) -> dict:
+    """Engine pool arguments for the configured DB_POOL.
+
+    "queue" keeps up to `pool_size + max_overflow` connections per process;
+    "null" opens a connection per checkout and closes it on return, which
+    suits serverless instances and external poolers such as PgBouncer.
+    """
+    pool = settings.DB_POOL or ("null" if settings.SERVERLESS else "queue")
+    if pool == "null":
+        return dict(poolclass=NullPool)
+    return dict(poolclass=metered_pool, **POOL_OPTIONS)
+
+
+# Engines and session factories are built on first use rather than at
+# import, so cold starts that never touch the database skip the driver
+# import, and the modules below can be imported without a DATABASE_URL.
+# Read them as `core.db.engine`, `core.db.SessionLocal`, etc.
+_lazy = {}
+_lazy_lock = threading.Lock()
+
+
+def _build_sync():
+    engine = create_engine(DATABASE_URL, **pool_options(MeteredQueuePool))
+    instrument_engine(engine)
+    replicas = None
+    if replica_urls():
+        members = []
+        for index, url in enumerate(replica_urls()):
+            replica_engine = create_engine(url, **pool_options(MeteredQueuePool))
+            replica_engine.pool.engine_label = f"sync-replica-{index}"
+            instrument_engine(replica_engine)
+            members.append(Replica(f"replica-{index}", replica_engine))
+        replicas = ReplicaSet(members, settings.REPLICA_HEALTH_CHECK_SECONDS)
+    routing = {"class_": RoutingSession, "replicas": replicas} if replicas else {}
+    return {
+        "engine": engine,
+        "SessionLocal": sessionmaker(autocommit=False, autoflush=False, bind=engine, **routing),
+        "replicas": replicas,
+    }
+
+
+def _build_async():
+    # Native asyncio engine, used by the routes when DB_ASYNC is enabled
+    if not settings.DB_ASYNC:
+        return {"async_engine": None, "AsyncSessionLocal": None, "async_replicas": None}
+    async_engine = create_async_engine(
+        async_database_url(DATABASE_URL),
+        **pool_options(MeteredAsyncAdaptedQueuePool)
+    )
+    instrument_engine(async_engine.sync_engine)
+    replicas = None
+    if replica_urls():
+        members = []
+        for index, url in enumerate(replica_urls()):
+            replica_engine = create_async_engine(async_database_url(url), **pool_options(MeteredAsyncAdaptedQueuePool))
+            replica_engine.sync_engine.pool.engine_label = f"async-replica-{index}"
+            instrument_engine(replica_engine.sync_engine)
+            members.append(Replica(f"async-replica-{index}", replica_engine.sync_engine, replica_engine))
+        replicas = ReplicaSet(members, settings.REPLICA_HEALTH_CHECK_SECONDS)
+    # AsyncSession passes the routing options on to its inner sync Session
+    routing = {"sync_session_class": RoutingSession, "replicas": replicas} if replicas else {}
+    return {
+        "async_engine": async_engine,
+        "AsyncSessionLocal": async_sessionmaker(async_engine, autoflush=False, **routing),
+        "async_replicas": replicas,
+    }
+
+
+_BUILDERS = {
+    "engine": _build_sync,
+    "SessionLocal": _build_sync,
+    "async_engine": _build_async,
+    "AsyncSessionLocal": _build_async,
+    "replicas": _build_sync,
+    "async_replicas": _build_async,
+}
+
+
+def _resolve(name: str):
+    if name not in _lazy:
+        with _lazy_lock:
+            if name not in _lazy:
+                _lazy.update(_BUILDERS[name]())
+    return _lazy[name]
+
+
+def replica_sets() -> list:
+    """Replica sets of the sync and (with DB_ASYNC) asyncio sessions, if any."""
+    return [replicas for replicas in (_resolve("replicas"), _resolve("async_replicas")) if replicas is not None]
+
+
+def __getattr__(name: str):
+    if name not in _BUILDERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _resolve(name)
+
 
 Base = declarative_base()
 
 # Dependency
-def get_db():
-    db = SessionLocal()
+async def get_db():
+    async_sessions = _resolve("AsyncSessionLocal")
+    if async_sessions is not None:
+        async with async_sessions() as db:
+            yield db
+        return
+
+    db = _resolve("SessionLocal")()
     try:
         yield db
     finally:
-        db.close()
+        # Closing returns the connection to the pool, which may roll back on the server
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db: Union[Session, AsyncSession], fn, *args, **kwargs):
+    """Run `fn(session, *args, **kwargs)` without blocking the event loop.
+
+    With an `AsyncSession` the function runs through `run_sync` on the
+    asyncio driver; with a plain `Session` it runs in the threadpool. Either
+    way `fn` is ordinary synchronous SQLAlchemy code and may lazy-load.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
 
-db_dependacy = Annotated[Session, Depends(get_db)]
\ No newline at end of file
+db_dependacy = Annotated[Union[Session, AsyncSession], Depends(get_db)]
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import List, Optional
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.config.settings import settings
+from core.utils.metrics import REPLICA_UP
+
+PIN_COOKIE = "primary_pin"
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Where the current request's sessions read from. Anything outside a routed
+# request (CLI commands, the like buffer, unsafe methods) uses the primary.
+PRIMARY, REPLICA, PINNED = "primary", "replica", "pinned"
+_read_target: ContextVar[str] = ContextVar("read_target", default=PRIMARY)
+
+
+def replica_urls() -> List[str]:
+    return [url.strip() for url in (settings.DATABASE_REPLICA_URLS or "").split(",") if url.strip()]
+
+
+def reads_pinned() -> bool:
+    """True while serving a read that must see the client's own recent write."""
+    return _read_target.get() == PINNED
+
+
+def reads_replica() -> bool:
+    """True while the current request's reads may come from a replica."""
+    return _read_target.get() == REPLICA
+
+
+class Replica:
+    """One read replica: the engine sessions bind to, and how to probe it."""
+
+    __slots__ = ("name", "engine", "async_engine", "down_until")
+
+    def __init__(self, name: str, engine: Engine, async_engine: Optional[AsyncEngine] = None):
+        self.name = name
+        # Sync engine handed out by `get_bind`; for the asyncio sessions this
+        # is `async_engine.sync_engine`, and the probe goes through the driver
+        self.engine = engine
+        self.async_engine = async_engine
+        self.down_until = 0.0
+
+    async def ping(self) -> None:
+        if self.async_engine is not None:
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        else:
+            await run_in_threadpool(self._ping_sync)
+
+    def _ping_sync(self) -> None:
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+
+class ReplicaSet:
+    """Round-robin over the replicas that are currently in rotation.
+
+    A replica leaves the rotation for `retry_seconds` when a health check
+    fails or a request loses its connection to it. After that it is offered
+    again, so instances without the background checker (serverless) recover
+    too. With no replica in rotation, reads fall back to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica], retry_seconds: float):
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+        for replica in replicas:
+            self._watch(replica)
+            REPLICA_UP.labels(replica.name).set(1)
+
+    def _watch(self, replica: Replica) -> None:
+        def on_error(context) -> None:
+            if context.is_disconnect:
+                self.mark_down(replica, context.original_exception)
+
+        event.listen(replica.engine, "handle_error", on_error)
+
+    def pick(self) -> Optional[Replica]:
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[self._next]
+                self._next = (self._next + 1) % len(self.replicas)
+                if replica.down_until <= now:
+                    return replica
+        return None
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        if replica.down_until <= time.monotonic():
+            print(f"Read replica {replica.name} taken out of rotation: {str(error)}")
+        replica.down_until = time.monotonic() + self.retry_seconds
+        REPLICA_UP.labels(replica.name).set(0)
+
+    def mark_up(self, replica: Replica) -> None:
+        if replica.down_until:
+            print(f"Read replica {replica.name} back in rotation")
+        replica.down_until = 0.0
+        REPLICA_UP.labels(replica.name).set(1)
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(replica.ping(), timeout=self.retry_seconds)
+            except Exception as e:
+                self.mark_down(replica, e)
+            else:
+                self.mark_up(replica)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.retry_seconds)
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica while the request allows it.
+
+    Flushes and insert/update/delete statements always go to the primary,
+    and so does everything after the session's first write. A session picks
+    its replica on the first read and keeps it, so one request never mixes
+    snapshots from two replicas.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._replica: Optional[Replica] = None
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+        if self._wrote or _read_target.get() != REPLICA:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._replica is None:
+            self._replica = self.replicas.pick()
+            if self._replica is None:
+                return super().get_bind(mapper, clause=clause, **kwargs)
+        return self._replica.engine
+
+
+class ReplicaRoutingMiddleware:
+    """Route GET/HEAD reads to replicas, with read-your-writes stickiness.
+
+    A successful write pins its client to the primary for `pin_seconds`.
+    The pin is a cookie, which follows browsers across workers, plus an
+    in-process entry keyed by the request's access token, for API clients
+    that send a Bearer header and no cookies. Pinned reads also bypass the
+    response cache, which another reader may have filled from a replica
+    that had not caught up yet; such entries expire with the pin (see
+    `ResponseCache.set`).
+    """
+
+    def __init__(self, app: ASGIApp, pin_seconds: int = 5, max_pins: int = 10_000):
+        self.app = app
+        self.pin_seconds = pin_seconds
+        self._pins = TTLCache(maxsize=max_pins, ttl=pin_seconds)
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        credential = self._credential(connection)
+
+        if scope["method"] in READ_METHODS:
+            token = _read_target.set(PINNED if self._is_pinned(connection, credential) else REPLICA)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _read_target.reset(token)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                expires = time.time() + self.pin_seconds
+                MutableHeaders(scope=message).append("Set-Cookie", self._pin_cookie(expires))
+                if credential is not None:
+                    with self._lock:
+                        self._pins[credential] = expires
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+    @staticmethod
+    def _credential(connection: HTTPConnection) -> Optional[str]:
+        authorization = connection.headers.get("authorization", "")
+        token = authorization[7:] if authorization.startswith("Bearer ") else connection.cookies.get("access_token")
+        return hashlib.sha256(token.encode()).hexdigest() if token else None
+
+    def _is_pinned(self, connection: HTTPConnection, credential: Optional[str]) -> bool:
+        try:
+            if float(connection.cookies.get(PIN_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        if credential is None:
+            return False
+        with self._lock:
+            return credential in self._pins
+
+    def _pin_cookie(self, expires: float) -> str:
+        cookie = SimpleCookie()
+        cookie[PIN_COOKIE] = str(int(expires) + 1)
+        morsel = cookie[PIN_COOKIE]
+        morsel["max-age"] = self.pin_seconds
+        morsel["path"] = "/"
+        morsel["httponly"] = True
+        morsel["samesite"] = "None" if settings.IS_PRODUCTION else "Lax"
+        if settings.IS_PRODUCTION:
+            morsel["secure"] = True
+        if settings.COOKIE_DOMAIN:
+            morsel["domain"] = settings.COOKIE_DOMAIN
+        return cookie.output(header="").strip()
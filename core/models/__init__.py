@@ -1,2 +1,4 @@
 from core.models.blogs import Blog
 from core.models.users import User
+from core.models.uploads import Upload
+from core.models import search
@@ -1,22 +1,38 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, text
+from sqlalchemy.orm import relationship, validates
 from core.db import Base
+from core.config.settings import settings
+from core.utils.text import count_words, make_excerpt, reading_time
 from datetime import datetime
-import math
 from slugify import slugify
 
 class Blog(Base):
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Backs the (date_added, id) keyset used by the blog listing
+        Index("ix_blogs_date_added_id", "date_added", "id"),
+        # Author pages filter by user and keep the same newest-first order
+        Index("ix_blogs_user_id_date_added_id", "user_id", "date_added", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     slug = Column(String, unique=True, index=True)
     description = Column(Text)
+    # Derived from description on write so listings never load the body
+    excerpt = Column(String, nullable=True)
+    word_count = Column(Integer, default=0, server_default="0", nullable=False)
+    reading_time = Column(Integer, default=0, server_default="0", nullable=False)
     tag = Column(String)
     members_only = Column(Boolean, default=False)
     image = Column(String)
     date_added = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, ForeignKey("users.id"))
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comments_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped on every change visible through the blog's read endpoints; feeds the ETags
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    date_last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="blogs")
     comments = relationship("Comment", back_populates="blog")
@@ -27,17 +43,22 @@ class Blog(Base):
         if 'title' in kwargs:
             self.slug = slugify(kwargs['title'])
 
-    @property
-    def word_count(self):
-        return len(self.description.split())
-      
-    @property
-    def reading_time(self):
-        average_reading_speed = 200
-        return math.ceil(self.word_count / average_reading_speed)
+    @validates("description")
+    def _derive_from_description(self, key, description):
+        # Runs when create_blog/update_blog write the body, never on reads
+        self.excerpt = make_excerpt(description)
+        self.word_count = count_words(description)
+        self.reading_time = reading_time(self.word_count, settings.READING_SPEED_WPM)
+        return description
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Comment pages and the blog detail read one blog's comments in (date_added, id) order
+        Index("ix_comments_blog_id_date_added_id", "blog_id", "date_added", "id"),
+        # Watermark of incremental comment exports
+        Index("ix_comments_date_last_updated", "date_last_updated"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Text)
@@ -45,12 +66,35 @@ class Comment(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     blog_id = Column(Integer, ForeignKey("blogs.id"))
     author = Column(String)
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped by edits and like count changes, so incremental exports pick them up
+    date_last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user = relationship("User", back_populates="comments")
     blog = relationship("Blog", back_populates="comments")
     likes = relationship("Like", back_populates="comment")
 
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # One like per user and target; partial so each index only covers its kind
+        Index(
+            "uq_likes_user_blog", "user_id", "blog_id", unique=True,
+            postgresql_where=text("blog_id IS NOT NULL"), sqlite_where=text("blog_id IS NOT NULL")
+        ),
+        Index(
+            "uq_likes_user_comment", "user_id", "comment_id", unique=True,
+            postgresql_where=text("comment_id IS NOT NULL"), sqlite_where=text("comment_id IS NOT NULL")
+        ),
+        # The unique indexes lead with user_id; deleting a blog or comment looks likes up by target
+        Index(
+            "ix_likes_blog_id", "blog_id",
+            postgresql_where=text("blog_id IS NOT NULL"), sqlite_where=text("blog_id IS NOT NULL")
+        ),
+        Index(
+            "ix_likes_comment_id", "comment_id",
+            postgresql_where=text("comment_id IS NOT NULL"), sqlite_where=text("comment_id IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
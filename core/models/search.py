@@ -0,0 +1,55 @@
+from sqlalchemy import DDL, event
+from core.models.blogs import Blog
+
+# Full-text search index over blog titles and descriptions.
+#
+# PostgreSQL keeps a generated, weighted tsvector column behind a GIN index;
+# SQLite keeps an external-content FTS5 table in sync through triggers. The
+# same statements are replayed by the matching Alembic migration.
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5("
+    "title, description, content='blogs', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS blogs_fts_ai AFTER INSERT ON blogs BEGIN "
+    "INSERT INTO blogs_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS blogs_fts_ad AFTER DELETE ON blogs BEGIN "
+    "INSERT INTO blogs_fts(blogs_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS blogs_fts_au AFTER UPDATE OF title, description ON blogs BEGIN "
+    "INSERT INTO blogs_fts(blogs_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO blogs_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+
+
+def is_search_object(name: str, type_: str) -> bool:
+    """True for the search objects above, which the models do not declare."""
+    if type_ == "table":
+        # blogs_fts plus FTS5's shadow tables (blogs_fts_data, _idx, ...)
+        return name.startswith("blogs_fts")
+    return (type_, name) in {("column", "search_vector"), ("index", "ix_blogs_search_vector")}
+
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Blog.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Blog.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Blog.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS blogs_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from core.db import Base
+from datetime import datetime
+
+class Upload(Base):
+    """One stored media file, addressed by the SHA-256 of its content."""
+    __tablename__ = "uploads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    key = Column(String, nullable=False)
+    url = Column(String, index=True, nullable=False)
+    content_type = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    # Number of blogs whose image is this upload; zero-ref uploads are collectable
+    ref_count = Column(Integer, default=0, server_default="0", nullable=False)
+    date_added = Column(DateTime, default=datetime.utcnow)
@@ -1,3 +1,5 @@
 from .blogs import blog_router
 from .media import media_router
-from .auth import auth_router
\ No newline at end of file
+from .auth import auth_router
+from .exports import export_router
+from .metrics import metrics_router
@@ -1,28 +1,20 @@
 # routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie, Request
 from fastapi.security import OAuth2PasswordBearer
-from core.db import db_dependacy, get_db
-from sqlalchemy.orm import Session
+from core.db import db_dependacy, get_db, run_db
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 
 from core.models.users import User
 from core.schemas.users import UserRetrieve
 from core.config.settings import settings
 from pydantic import BaseModel
-import httpx
-from jose import JWTError, jwt
+from jose import JWTError
 from datetime import datetime, timedelta
 from typing import Optional
 import secrets
-from contextlib import contextmanager
-
-@contextmanager
-def get_httpx_client():
-    client = httpx.Client()
-    try:
-        yield client
-    finally:
-        client.close()
+from core.services.google import GoogleTokenError, GoogleUnavailableError, google_verifier
+from core.utils.auth_cache import USER_SNAPSHOT_COLUMNS, auth_cache
 
 auth_router = APIRouter(tags=["Authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -66,12 +58,50 @@ def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token():
     return secrets.token_urlsafe(32)
 
+def decode_access_token(token: str) -> dict:
+    claims = auth_cache.get_claims(token)
+    if claims is None:
+        # jose.jwt pulls in the crypto backends; only load it when a token is signed or checked
+        from jose import jwt
+
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        auth_cache.set_claims(token, claims)
+    return claims
+
+def load_user_by_email(db: Session, email: str) -> Optional[User]:
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        # Detach so later commits in the request cannot expire its attributes
+        db.expunge(user)
+    return user
+
+def user_from_snapshot(snapshot: dict) -> User:
+    # A fresh detached instance per request, so callers never share state
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+async def load_current_user(db: Session, email: str) -> Optional[User]:
+    snapshot = auth_cache.get_user(email)
+    if snapshot is not None:
+        return user_from_snapshot(snapshot)
+    user = await run_db(db, load_user_by_email, email)
+    if user is not None:
+        auth_cache.set_user(email, {column: getattr(user, column) for column in USER_SNAPSHOT_COLUMNS})
+    return user
+
+def invalidate_user(email: str) -> None:
+    """Drop the cached row for `email`; call after any write to that user."""
+    auth_cache.invalidate_user(email)
+
 async def get_current_user(
     db: Session = Depends(get_db),
     access_token: str = None,
@@ -87,7 +117,7 @@ async def get_current_user(
             
         if access_token:
             try:
-                payload = jwt.decode(access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                payload = decode_access_token(access_token)
                 email: str = payload.get("sub")
                 if email is None:
                     raise HTTPException(status_code=401, detail="Invalid access token")
@@ -103,7 +133,7 @@ async def get_current_user(
         else:
             raise HTTPException(status_code=401, detail="No valid token provided")
         
-        user = db.query(User).filter(User.email == email).first()
+        user = await load_current_user(db, email)
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
         return user
@@ -155,21 +185,15 @@ async def google_auth(token_data: TokenData, response: Response, db: db_dependac
         print(f"Production mode: {settings.IS_PRODUCTION}")
         print(f"Cookie domain: {settings.COOKIE_DOMAIN}")
         
-        with get_httpx_client() as client:
-            google_response = client.get(
-                'https://www.googleapis.com/oauth2/v3/userinfo',
-                params={'access_token': token_data.token},
-                timeout=5.0
-            )
-        
-        if google_response.status_code != 200:
-            print(f"Google API error: {google_response.status_code} - {google_response.text}")
+        try:
+            user_data = await google_verifier.verify(token_data.token)
+        except GoogleTokenError as e:
+            print(f"Google API error: {e.status_code} - {e.text}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Failed to verify Google token: {google_response.status_code}"
+                detail=f"Failed to verify Google token: {e.status_code}"
             )
         
-        user_data = google_response.json()
         print(f"Received user data from Google: {user_data}")
         
         user_email = user_data.get('email')
@@ -179,26 +203,31 @@ async def google_auth(token_data: TokenData, response: Response, db: db_dependac
         user_name = user_data.get('name', '')
         user_picture = user_data.get('picture', '')
 
-        user = db.query(User).filter(User.email == user_email).first()
-        if not user:
-            print(f"Creating new user with email: {user_email}")
-            user = User(
-                email=user_email,
-                name=user_name,
-                picture=user_picture
-            )
-            db.add(user)
-        else:
-            print(f"Updating existing user: {user_email}")
-            user.name = user_name
-            user.picture = user_picture
-        
         access_token = create_access_token({"sub": user_email})
         refresh_token = create_refresh_token()
-        
-        user.refresh_token = refresh_token
-        db.commit()
-        db.refresh(user)
+
+        def upsert_user(db):
+            user = db.query(User).filter(User.email == user_email).first()
+            if not user:
+                print(f"Creating new user with email: {user_email}")
+                user = User(
+                    email=user_email,
+                    name=user_name,
+                    picture=user_picture
+                )
+                db.add(user)
+            else:
+                print(f"Updating existing user: {user_email}")
+                user.name = user_name
+                user.picture = user_picture
+            
+            user.refresh_token = refresh_token
+            db.commit()
+            db.refresh(user)
+            return UserRetrieve.model_validate(user)
+
+        user = await run_db(db, upsert_user)
+        invalidate_user(user_email)
 
         # Use helper function to set cookies
         set_auth_cookies(response, access_token, refresh_token)
@@ -208,10 +237,10 @@ async def google_auth(token_data: TokenData, response: Response, db: db_dependac
         return {
             "access_token": access_token,
             "token_type": "bearer",
-            "user": UserRetrieve.model_validate(user)
+            "user": user
         }
 
-    except httpx.RequestError as e:
+    except GoogleUnavailableError as e:
         print(f"Network error during Google authentication: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -237,20 +266,25 @@ async def refresh_token(
         )
     
     try:
-        user = db.query(User).filter(User.refresh_token == refresh_token).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid refresh token"
-            )
+        new_refresh_token = create_refresh_token()
+
+        def rotate(db):
+            user = db.query(User).filter(User.refresh_token == refresh_token).first()
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid refresh token"
+                )
+
+            # Update refresh token in the database
+            user.refresh_token = new_refresh_token
+            db.commit()
+            return UserRetrieve.model_validate(user)
+
+        user = await run_db(db, rotate)
 
         # Create new tokens
         new_access_token = create_access_token({"sub": user.email})
-        new_refresh_token = create_refresh_token()
-
-        # Update refresh token in the database
-        user.refresh_token = new_refresh_token
-        db.commit()
 
         # Use helper function to set cookies
         set_auth_cookies(response, new_access_token, new_refresh_token)
@@ -258,7 +292,7 @@ async def refresh_token(
         return {
             "access_token": new_access_token,
             "token_type": "bearer",
-            "user": UserRetrieve.model_validate(user)
+            "user": user
         }
 
     except JWTError:
@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Query
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from core.db import db_dependacy, get_db
+from core.config.settings import settings
+from core.db import db_dependacy, get_db, run_db
 from core.models.blogs import Blog, Comment, Like
 from core.models.users import User
-from core.schemas.blogs import BlogCreate, BlogRetrieve, CommentCreate, CommentRetrieve, CommentUpdate
+from core.schemas.blogs import BlogCreate, BlogRetrieve, BlogSummary, CommentCreate, CommentPage, CommentRetrieve, CommentUpdate, ImportReport
 from core.schemas.users import UserRetrieve
 from typing import List, Optional
 from core.routes.auth import get_current_user
+from core.services.blogs import adjust_counter, load_blog_detail, load_blog_page, load_blog_stamp, load_comment_page, load_user_blogs, touch_blog
+from core.services.imports import BlogImporter, ImportTooLarge, aiter_lines
+from core.services.likes import buffered_variant, like_buffer, toggle_like, toggle_like_buffered, with_buffered_counts
+from core.services.search import search_blogs
+from core.services.uploads import adjust_upload_refs
+from core.utils.cache import BLOG_LIST_TAG, CachedResponse, blog_tag, response_cache
+from core.utils.http_cache import blog_etag, is_not_modified, not_modified_response, validator_headers
+from core.utils.pagination import decode_cursor, decode_offset_cursor, encode_offset_cursor
 from slugify import slugify
 
 
 blog_router = APIRouter(tags=["Blogs"])
+blog_list_adapter = TypeAdapter(List[BlogSummary])
+
+
+def conditional_response(request: Request, entry: CachedResponse, hit: bool):
+    """Serve a cached entry, or a bodiless 304 when the client's copy is current."""
+    if is_not_modified(request.headers, entry.headers):
+        return not_modified_response(entry.headers)
+    return entry.as_response(hit=hit)
+
 
 @blog_router.post("/blogs", response_model=BlogRetrieve)
 async def create_blog(
@@ -35,11 +57,17 @@ async def create_blog(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        db_blog = Blog(**blog.dict(), user_id=current_user.id)
-        db.add(db_blog)
-        db.commit()
-        db.refresh(db_blog)
-        return db_blog
+        def create(db):
+            db_blog = Blog(**blog.dict(), user_id=current_user.id)
+            db.add(db_blog)
+            adjust_upload_refs(db, db_blog.image, 1)
+            db.commit()
+            db.refresh(db_blog)
+            return BlogRetrieve.model_validate(db_blog)
+
+        created = await run_db(db, create)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(created.slug))
+        return created
         
     except Exception as e:
         print(f"Error in create_blog: {str(e)}")
@@ -49,72 +77,168 @@ async def create_blog(
         )
     
 
-@blog_router.get("/blogs", response_model=List[BlogRetrieve])
+@blog_router.post("/blogs/import", response_model=ImportReport)
+async def import_blogs(
+    request: Request,
+    db: db_dependacy,
+    authorization: Optional[str] = Header(None)
+):
+    """Bulk-create blogs from a newline-delimited JSON body.
+
+    Each line is a `BlogCreate` object, optionally with its original
+    `date_added`. The body is read as a stream and inserted in batches of
+    `IMPORT_BATCH_SIZE`; invalid lines are reported by line number and
+    skipped, and taken slugs get a numeric suffix. A body over
+    `IMPORT_MAX_BYTES` or a line over `IMPORT_MAX_LINE_BYTES` stops the
+    import with 413; batches inserted before that point are kept.
+    """
+    try:
+        access_token = None
+        refresh_token = None
+
+        if authorization and authorization.startswith('Bearer '):
+            access_token = authorization.split(' ')[1]
+        else:
+            access_token = request.cookies.get("access_token")
+            refresh_token = request.cookies.get("refresh_token")
+
+        current_user = await get_current_user(db, access_token, refresh_token)
+        if not current_user:
+            raise HTTPException(status_code=401, detail="Authentication required")
+
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > settings.IMPORT_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Import exceeds {settings.IMPORT_MAX_BYTES} bytes"
+            )
+
+        importer = BlogImporter(current_user.id)
+        lines = aiter_lines(request.stream(), settings.IMPORT_MAX_BYTES, settings.IMPORT_MAX_LINE_BYTES)
+        try:
+            async for line_no, line in lines:
+                if importer.feed(line_no, line):
+                    await run_db(db, importer.flush)
+            await run_db(db, importer.flush)
+        except ImportTooLarge as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        finally:
+            # Batches committed before a failure are visible either way
+            if importer.report.imported:
+                response_cache.invalidate(BLOG_LIST_TAG)
+        return importer.report
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in import_blogs: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@blog_router.get("/blogs", response_model=List[BlogSummary])
 async def get_blogs(
+    request: Request,
     db: db_dependacy,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 10  # Default to 10 if not specified
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None
 ):
-    query = db.query(Blog)
-    
+    """List blogs newest first, or by relevance when `search` is given.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the
+    next page; `skip` is kept for older clients.
+    """
+    before = None
+    offset = skip
+    if cursor:
+        try:
+            if search:
+                offset = decode_offset_cursor(cursor)
+            else:
+                before = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    cache_key = ("blogs", search, skip, limit, cursor)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached, hit=True)
+
+    headers = {}
+    # Toggles still in the write-behind buffer are not in the rows yet
+    buffered = like_buffer.blog_counts()
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(Blog.title.ilike(search_term))
-    
-    # Order by date_added descending (newest first)
-    query = query.order_by(Blog.date_added.desc())
-    
-    # Apply pagination
-    blogs = query.offset(skip).limit(limit).all()
-    return blogs
+        hits = await run_db(db, search_blogs, search, offset, limit + 1)
+        if len(hits) > limit:
+            hits = hits[:limit]
+            headers["X-Next-Cursor"] = encode_offset_cursor(offset + limit)
+        blogs = [
+            BlogSummary.model_validate(blog).model_copy(update={"snippet": snippet})
+            for blog, snippet in hits
+        ]
+    else:
+        blogs, next_cursor = await run_db(db, load_blog_page, skip, limit, before)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+
+    body = blog_list_adapter.dump_json(
+        with_buffered_counts(blog_list_adapter.validate_python(blogs, from_attributes=True), "blog", buffered)
+    )
+    # Listings span many blogs, so their ETag is a digest of the body itself
+    headers.update(validator_headers("get_blogs", '"{}"'.format(hashlib.sha256(body).hexdigest()[:32])))
+    entry = response_cache.set(cache_key, body, headers, [BLOG_LIST_TAG])
+    return conditional_response(request, entry, hit=False)
 
 @blog_router.get("/blogs/{slug}", response_model=BlogRetrieve)
-async def get_blog(slug: str, db: db_dependacy):
+async def get_blog(slug: str, request: Request, db: db_dependacy):
     try:
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if blog is None:
+        cache_key = ("blog", slug)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, cached, hit=True)
+
+        # Toggles still in the write-behind buffer are not in the rows yet
+        pending = like_buffer.counts_by_blog()
+
+        # Answer revalidations from the version stamp before loading comments
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            stamp = await run_db(db, load_blog_stamp, slug)
+            if stamp is None:
+                raise HTTPException(status_code=404, detail="Blog not found")
+            buffered = pending.get(stamp.id, {})
+            headers = validator_headers(
+                "get_blog", blog_etag("blog", stamp.id, stamp.version, buffered_variant(buffered)),
+                None if buffered else stamp.date_last_updated
+            )
+            if is_not_modified(request.headers, headers):
+                return not_modified_response(headers)
+
+        loaded = await run_db(db, load_blog_detail, slug)
+        if loaded is None:
             raise HTTPException(status_code=404, detail="Blog not found")
-        
-        comments = []
-        for comment in blog.comments:
-            author = db.query(User).filter(User.id == comment.user_id).first()
-            
-            comment_dict = CommentRetrieve(
-                id=comment.id,
-                text=comment.text,
-                date_added=comment.date_added,
-                user_id=comment.user_id,
-                blog_id=comment.blog_id,
-                author=comment.author,
-                author_picture=author.picture,
-                liked=False,  # This will be updated based on current user
-                likes_count=db.query(Like).filter(Like.comment_id == comment.id).count()
+        blog, payload = loaded
+        buffered = pending.get(blog.id, {})
+        if buffered:
+            payload = with_buffered_counts([payload], "blog", buffered)[0].model_copy(
+                update={"comments": with_buffered_counts(payload.comments, "comment", buffered)}
             )
-            comments.append(comment_dict)
-        
-        # Get likes for the blog post
-        blog_likes_count = db.query(Like).filter(Like.blog_id == blog.id).count()
-        
-        return BlogRetrieve(
-            id=blog.id,
-            slug=blog.slug,
-            date_added=blog.date_added,
-            title=blog.title,
-            description=blog.description,
-            tag=blog.tag,
-            reading_time=blog.reading_time,
-            members_only=blog.members_only,
-            image=blog.image,
-            comments=comments,
-            likes_count=blog_likes_count
+        headers = validator_headers(
+            "get_blog", blog_etag("blog", blog.id, blog.version, buffered_variant(buffered)),
+            None if buffered else blog.date_last_updated
         )
+        body = payload.model_dump_json().encode()
+        entry = response_cache.set(cache_key, body, headers, [blog_tag(slug)])
+        return conditional_response(request, entry, hit=False)
     except Exception as e:
         print(f"Error in get_blog: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
     
 
-@blog_router.get("/user/blogs", response_model=List[BlogRetrieve])
+@blog_router.get("/user/blogs", response_model=List[BlogSummary])
 async def get_user_blogs(
     request: Request,
     db: Session = Depends(get_db),
@@ -127,8 +251,9 @@ async def get_user_blogs(
     if not current_user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    blogs = db.query(Blog).filter(Blog.user_id == current_user.id).all()
-    return blogs
+    buffered = like_buffer.blog_counts()
+    blogs = await run_db(db, load_user_blogs, current_user.id)
+    return with_buffered_counts(blog_list_adapter.validate_python(blogs, from_attributes=True), "blog", buffered)
 
 @blog_router.put("/blogs/{slug}", response_model=BlogRetrieve)
 async def update_blog(
@@ -158,24 +283,36 @@ async def update_blog(
                 detail="Not authenticated"
             )
         
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if not blog:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        if blog.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to edit this blog")
-        
-        # Update blog fields
-        for field, value in blog_update.dict().items():
-            setattr(blog, field, value)
-        
-        # Update slug if title has changed
-        if blog_update.title:
-            blog.slug = slugify(blog_update.title)
-        
-        db.commit()
-        db.refresh(blog)
-        return blog
+        def update(db):
+            blog = db.query(Blog).filter(Blog.slug == slug).first()
+            if not blog:
+                raise HTTPException(status_code=404, detail="Blog not found")
+            
+            if blog.user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to edit this blog")
+            
+            previous_image = blog.image
+
+            # Update blog fields
+            for field, value in blog_update.dict().items():
+                setattr(blog, field, value)
+
+            if blog.image != previous_image:
+                adjust_upload_refs(db, previous_image, -1)
+                adjust_upload_refs(db, blog.image, 1)
+            
+            # Update slug if title has changed
+            if blog_update.title:
+                blog.slug = slugify(blog_update.title)
+            blog.version = Blog.version + 1
+            
+            db.commit()
+            db.refresh(blog)
+            return BlogRetrieve.model_validate(blog)
+
+        updated = await run_db(db, update)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug), blog_tag(updated.slug))
+        return updated
         
     except Exception as e:
         print(f"Error in update_blog: {str(e)}")
@@ -192,45 +329,63 @@ async def delete_blog(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a blog post"""
-    blog = db.query(Blog).filter(Blog.slug == slug).first()
-    if not blog:
-        raise HTTPException(status_code=404, detail="Blog not found")
-    
-    if blog.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this blog")
-    
-    db.delete(blog)
-    db.commit()
+    def delete(db):
+        blog = db.query(Blog).filter(Blog.slug == slug).first()
+        if not blog:
+            raise HTTPException(status_code=404, detail="Blog not found")
+        
+        if blog.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to delete this blog")
+        
+        adjust_upload_refs(db, blog.image, -1)
+        db.delete(blog)
+        db.commit()
+
+    await run_db(db, delete)
+    response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
     return {"detail": "Blog deleted successfully"}
 
-@blog_router.get("/blogs/{slug}/comments", response_model=List[CommentRetrieve])
-async def get_comments(slug: str, db: db_dependacy):
-    """Get comments for a blog post - public access"""
-    blog = db.query(Blog).filter(Blog.slug == slug).first()
-    if blog is None:
+@blog_router.get("/blogs/{slug}/comments", response_model=CommentPage)
+async def get_comments(
+    slug: str,
+    request: Request,
+    db: db_dependacy,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Get a page of comments for a blog post - public access"""
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    cache_key = ("comments", slug, cursor, limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached, hit=True)
+
+    # Toggles still in the write-behind buffer are not in the rows yet
+    pending = like_buffer.counts_by_blog()
+    stamp = await run_db(db, load_blog_stamp, slug)
+    if stamp is None:
         raise HTTPException(status_code=404, detail="Blog not found")
+    buffered = pending.get(stamp.id, {})
+    headers = validator_headers(
+        "get_comments",
+        blog_etag("comments", stamp.id, stamp.version, limit, cursor, buffered_variant(buffered)),
+        None if buffered else stamp.date_last_updated
+    )
+    if is_not_modified(request.headers, headers):
+        return not_modified_response(headers)
     
-    comments = db.query(Comment).filter(Comment.blog_id == blog.id).all()
-    
-    comment_list = []
-    for comment in comments:
-        author = db.query(User).filter(User.id == comment.user_id).first()
-        likes_count = db.query(Like).filter(Like.comment_id == comment.id).count()
-        
-        comment_data = CommentRetrieve(
-            id=comment.id,
-            text=comment.text,
-            date_added=comment.date_added,
-            user_id=comment.user_id,
-            blog_id=comment.blog_id,
-            author=author.username if author else "Unknown",
-            author_picture=author.picture if author else "",
-            liked=False,  # Default to False for public access
-            likes_count=likes_count
-        )
-        comment_list.append(comment_data)
-    
-    return comment_list
+    page = await run_db(db, load_comment_page, stamp.id, limit, after)
+    if buffered:
+        page = page.model_copy(update={"items": with_buffered_counts(page.items, "comment", buffered)})
+    body = page.model_dump_json().encode()
+    entry = response_cache.set(cache_key, body, headers, [blog_tag(slug)])
+    return conditional_response(request, entry, hit=False)
 
 @blog_router.post("/blogs/{slug}/comments", response_model=CommentRetrieve)
 async def create_comment(
@@ -260,36 +415,45 @@ async def create_comment(
                 detail="Authentication required"
             )
 
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if blog is None:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
         author_name = current_user.username or current_user.name
-        
-        db_comment = Comment(
-            **comment.dict(),
-            user_id=current_user.id,
-            blog_id=blog.id,
-            author=author_name 
-        )
-        db.add(db_comment)
-        db.commit()
-        db.refresh(db_comment)
-        
-        return CommentRetrieve(
-            id=db_comment.id,
-            text=db_comment.text,
-            date_added=db_comment.date_added,
-            user_id=db_comment.user_id,
-            blog_id=db_comment.blog_id,
-            author=author_name,
-            author_picture=current_user.picture,
-            liked=False,
-            likes_count=0
-        )
+
+        def create(db):
+            try:
+                blog = db.query(Blog).filter(Blog.slug == slug).first()
+                if blog is None:
+                    raise HTTPException(status_code=404, detail="Blog not found")
+                
+                db_comment = Comment(
+                    **comment.dict(),
+                    user_id=current_user.id,
+                    blog_id=blog.id,
+                    author=author_name 
+                )
+                db.add(db_comment)
+                adjust_counter(db, Blog.comments_count, blog.id, 1)
+                db.commit()
+                db.refresh(db_comment)
+            except Exception:
+                db.rollback()
+                raise
+            
+            return CommentRetrieve(
+                id=db_comment.id,
+                text=db_comment.text,
+                date_added=db_comment.date_added,
+                user_id=db_comment.user_id,
+                blog_id=db_comment.blog_id,
+                author=author_name,
+                author_picture=current_user.picture,
+                liked=False,
+                likes_count=0
+            )
+
+        created = await run_db(db, create)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
+        return created
     except Exception as e:
         print(f"Error in create_comment: {str(e)}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @blog_router.post("/blogs/{slug}/comments/{comment_id}/like", response_model=dict)
@@ -319,38 +483,26 @@ async def like_comment(
                 detail="Authentication required"
             )
 
-        # Verify blog and comment exist
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if not blog:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        comment = db.query(Comment).filter(
-            Comment.id == comment_id, 
-            Comment.blog_id == blog.id
-        ).first()
-        if not comment:
-            raise HTTPException(status_code=404, detail="Comment not found")
-        
-        # Check if user has already liked this comment
-        existing_like = db.query(Like).filter(
-            Like.user_id == current_user.id,
-            Like.comment_id == comment_id
-        ).first()
-        
-        if existing_like:
-            db.delete(existing_like)
-            db.commit()
-            liked = False
-        else:
-            new_like = Like(
-                user_id=current_user.id,
-                comment_id=comment_id
+        def toggle(db):
+            # Verify blog and comment exist
+            blog_id = db.scalar(
+                select(Blog.id)
+                .join(Comment, Comment.blog_id == Blog.id)
+                .where(Blog.slug == slug, Comment.id == comment_id)
             )
-            db.add(new_like)
+            if blog_id is None:
+                exists = db.scalar(select(Blog.id).where(Blog.slug == slug))
+                raise HTTPException(status_code=404, detail="Comment not found" if exists else "Blog not found")
+
+            liked, likes_count = toggle_like(db, current_user.id, Like.comment_id, comment_id, blog_id)
             db.commit()
-            liked = True
-        
-        likes_count = db.query(Like).filter(Like.comment_id == comment_id).count()
+            return liked, likes_count
+
+        if settings.LIKE_WRITE_BEHIND:
+            liked, likes_count = await toggle_like_buffered(db, current_user.id, slug, comment_id)
+        else:
+            liked, likes_count = await run_db(db, toggle)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
         
         return {
             "liked": liked,
@@ -391,33 +543,39 @@ async def update_comment(
                 detail="Authentication required"
             )
 
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if not blog:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        comment = db.query(Comment).filter(Comment.id == comment_id, Comment.blog_id == blog.id).first()
-        if not comment:
-            raise HTTPException(status_code=404, detail="Comment not found")
-        
-        if comment.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to edit this comment")
-        
-        comment.text = comment_update.text
-        db.commit()
-        db.refresh(comment)
-
-        author = db.query(User).filter(User.id == comment.user_id).first()
-        return CommentRetrieve(
-            id=comment.id,
-            text=comment.text,
-            date_added=comment.date_added,
-            user_id=comment.user_id,
-            blog_id=comment.blog_id,
-            author=author.username if author else "Unknown",
-            author_picture=author.picture if author else "",
-            liked=False,  # You might want to check if the current user liked this comment
-            likes_count=db.query(Like).filter(Like.comment_id == comment.id).count()
-        )
+        def update(db):
+            blog = db.query(Blog).filter(Blog.slug == slug).first()
+            if not blog:
+                raise HTTPException(status_code=404, detail="Blog not found")
+            
+            comment = db.query(Comment).filter(Comment.id == comment_id, Comment.blog_id == blog.id).first()
+            if not comment:
+                raise HTTPException(status_code=404, detail="Comment not found")
+            
+            if comment.user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to edit this comment")
+            
+            comment.text = comment_update.text
+            touch_blog(db, blog.id)
+            db.commit()
+            db.refresh(comment)
+
+            author = db.query(User).filter(User.id == comment.user_id).first()
+            return CommentRetrieve(
+                id=comment.id,
+                text=comment.text,
+                date_added=comment.date_added,
+                user_id=comment.user_id,
+                blog_id=comment.blog_id,
+                author=author.username if author else "Unknown",
+                author_picture=author.picture if author else "",
+                liked=False,  # You might want to check if the current user liked this comment
+                likes_count=comment.likes_count
+            )
+
+        updated = await run_db(db, update)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
+        return updated
     
     except Exception as e:
         print(f"Error in update_comment: {str(e)}")
@@ -451,19 +609,24 @@ async def delete_comment(
                 detail="Authentication required"
             )
 
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if not blog:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        comment = db.query(Comment).filter(Comment.id == comment_id, Comment.blog_id == blog.id).first()
-        if not comment:
-            raise HTTPException(status_code=404, detail="Comment not found")
-        
-        if comment.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
-        
-        db.delete(comment)
-        db.commit()
+        def delete(db):
+            blog = db.query(Blog).filter(Blog.slug == slug).first()
+            if not blog:
+                raise HTTPException(status_code=404, detail="Blog not found")
+            
+            comment = db.query(Comment).filter(Comment.id == comment_id, Comment.blog_id == blog.id).first()
+            if not comment:
+                raise HTTPException(status_code=404, detail="Comment not found")
+            
+            if comment.user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
+            
+            db.delete(comment)
+            adjust_counter(db, Blog.comments_count, blog.id, -1)
+            db.commit()
+
+        await run_db(db, delete)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
         return {"detail": "Comment deleted successfully"}
     
     except Exception as e:
@@ -493,20 +656,22 @@ async def like_blog(slug: str, request: Request, db: Session = Depends(get_db),
                 detail="Not Authenticated",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        blog = db.query(Blog).filter(Blog.slug == slug).first()
-        if blog is None:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        like = db.query(Like).filter(Like.user_id == current_user.id, Like.blog_id == blog.id).first()
-        if like:
-            db.delete(like)
+        def toggle(db):
+            blog_id = db.scalar(select(Blog.id).where(Blog.slug == slug))
+            if blog_id is None:
+                raise HTTPException(status_code=404, detail="Blog not found")
+
+            liked, likes_count = toggle_like(db, current_user.id, Like.blog_id, blog_id, blog_id)
             db.commit()
-            return {"liked": False, "likes_count": db.query(Like).filter(Like.blog_id == blog.id).count()}
+            return {"liked": liked, "likes_count": likes_count}
+
+        if settings.LIKE_WRITE_BEHIND:
+            liked, likes_count = await toggle_like_buffered(db, current_user.id, slug)
+            result = {"liked": liked, "likes_count": likes_count}
         else:
-            new_like = Like(user_id=current_user.id, blog_id=blog.id)
-            db.add(new_like)
-            db.commit()
-            return {"liked": True, "likes_count": db.query(Like).filter(Like.blog_id == blog.id).count()}
+            result = await run_db(db, toggle)
+        response_cache.invalidate(BLOG_LIST_TAG, blog_tag(slug))
+        return result
     
     except Exception as e:
         print(f"Error in like_blog: {str(e)}")
@@ -516,11 +681,29 @@ async def like_blog(slug: str, request: Request, db: Session = Depends(get_db),
         )
 
 @blog_router.get("/blogs/{slug}/like", response_model=dict)
-async def get_like_status(slug: str, db: db_dependacy):
+async def get_like_status(slug: str, request: Request, db: db_dependacy):
     """Get like status for a blog post - public access"""
-    blog = db.query(Blog).filter(Blog.slug == slug).first()
-    if blog is None:
+    cache_key = ("like_status", slug)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_response(request, cached, hit=True)
+
+    stamp = await run_db(db, load_blog_stamp, slug)
+    if stamp is None:
         raise HTTPException(status_code=404, detail="Blog not found")
+    # Toggles still in the write-behind buffer are not in the row yet
+    buffered = like_buffer.likes_count("blog", stamp.id)
+    if buffered is None:
+        headers = validator_headers(
+            "get_like_status", blog_etag("likes", stamp.id, stamp.version), stamp.date_last_updated
+        )
+        likes_count = stamp.likes_count
+    else:
+        headers = validator_headers(
+            "get_like_status", blog_etag("likes", stamp.id, stamp.version, f"b{buffered}")
+        )
+        likes_count = buffered
     
-    likes_count = db.query(Like).filter(Like.blog_id == blog.id).count()
-    return {"liked": False, "likes_count": likes_count}  # Default to False for public access
\ No newline at end of file
+    body = json.dumps({"liked": False, "likes_count": likes_count}).encode()  # Default to False for public access
+    entry = response_cache.set(cache_key, body, headers, [blog_tag(slug)])
+    return conditional_response(request, entry, hit=False)
\ No newline at end of file
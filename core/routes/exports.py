@@ -0,0 +1,52 @@
+import secrets
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from core.config.settings import settings
+from core.services.exports import EXPORT_FORMATS, EXPORT_TABLES, is_incremental, iter_export, next_watermark
+
+export_router = APIRouter(tags=["Export"])
+
+
+def check_export_token(token: Optional[str]) -> None:
+    # Exports include members-only posts, so they sit behind a shared secret
+    if not settings.EXPORT_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not token or not secrets.compare_digest(token, settings.EXPORT_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid export token")
+
+
+@export_router.get("/export/{table}")
+async def export_table(
+    table: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Only rows changed at or after this time"),
+    gzip: bool = True,
+    x_export_token: Optional[str] = Header(None)
+):
+    """Stream a full or incremental dump of `blogs`, `comments` or `likes`.
+
+    Pass the `X-Export-Watermark` header of one export as `since` of the
+    next to fetch only what changed in between, plus a short overlap.
+    Incremental exports hold no deletions, and `likes` is always exported
+    in full; `X-Export-Mode` says which one a response is.
+    """
+    check_export_token(x_export_token)
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    # Taken before reading so rows written during the export are picked up next time
+    watermark = next_watermark()
+    filename = f"{table}-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        iter_export(table, format, since, compress=gzip, batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Watermark": watermark.isoformat(),
+            "X-Export-Mode": "incremental" if is_incremental(table, since) else "full",
+        },
+    )
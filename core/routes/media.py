@@ -1,16 +1,78 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-import cloudinary
-import cloudinary.uploader
+from typing import BinaryIO
+from anyio import CapacityLimiter, to_thread
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.datastructures import UploadFile
+from core.config.settings import settings
+from core.db import db_dependacy, run_db
+from core.services.uploads import find_upload_url, record_upload
+from core.services.storage import LocalStorage, media_path, storage
+from core.utils.uploads import check_content_length, inspect_upload, parse_upload_form
 
 media_router = APIRouter(tags=["Media"])
 
-@media_router.post("/upload-image", status_code=201)
-async def upload_image(file: UploadFile = File(...)):
+# Uploads get their own threads so slow ones cannot starve the shared
+# threadpool that sync database work runs on
+upload_limiter = CapacityLimiter(settings.MAX_CONCURRENT_UPLOADS)
+
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+def store_image(fileobj: BinaryIO, key: str, content_type: str) -> str:
+    # Rendering variants first also rejects files that only look like images
+    storage.save_variants(fileobj, key)
+    fileobj.seek(0)
+    return storage.save(fileobj, key, content_type)
+
+@media_router.post("/upload-image", status_code=201, openapi_extra=UPLOAD_FORM_SCHEMA)
+async def upload_image(request: Request, db: db_dependacy):
+    check_content_length(request, settings.MAX_UPLOAD_BYTES)
+    form = await parse_upload_form(request, settings.MAX_UPLOAD_BYTES)
     try:
-        result = cloudinary.uploader.upload(file.file)
-        return {"image_url": result["secure_url"]}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="Image upload failed")
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=422, detail="A file field is required")
 
+        info = await inspect_upload(file, settings.MAX_UPLOAD_BYTES, settings.UPLOAD_CHUNK_BYTES)
+        # Known content is answered from the uploads table without touching storage
+        existing_url = await run_db(db, find_upload_url, info.sha256)
+        if existing_url is not None:
+            return {"image_url": existing_url}
 
+        # Content-addressed keys: variants are cached by source hash and size
+        key = f"{info.sha256}.{info.extension}"
+        try:
+            url = await to_thread.run_sync(
+                store_image, file.file, key, info.content_type, limiter=upload_limiter
+            )
+        except Exception as e:
+            print(f"Error in upload_image: {str(e)}")
+            raise HTTPException(status_code=400, detail="Image upload failed")
+        url = await run_db(db, record_upload, info, key, url)
+        return {"image_url": url}
+    finally:
+        await form.close()
 
+@media_router.get(media_path() + "/variants/{stem}/{filename}", include_in_schema=False)
+async def get_image_variant(stem: str, filename: str):
+    """Serve a local variant, rendering it on first request if it is missing."""
+    variant, _, extension = filename.partition(".")
+    fmt = {"webp": "webp", "jpg": "jpeg"}.get(extension)
+    if not isinstance(storage, LocalStorage) or fmt is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    path = await to_thread.run_sync(storage.ensure_variant, stem, variant, fmt, limiter=upload_limiter)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
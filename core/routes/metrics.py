@@ -0,0 +1,21 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
+from core.config.settings import settings
+from core.utils.metrics import render_metrics
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text exposition, aggregated over every worker in multiprocess mode."""
+    if settings.IS_PRODUCTION and not settings.METRICS_TOKEN:
+        # Route names, latencies and replica health are not for the public
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        token = authorization.removeprefix("Bearer ") if authorization else ""
+        if not secrets.compare_digest(token, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
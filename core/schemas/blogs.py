@@ -1,7 +1,8 @@
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, HttpUrl, Field, computed_field
 from datetime import datetime
+from core.services.storage import storage
 from core.utils import enums
-from typing import Optional
+from typing import Dict, Optional
 
 class CommentBase(BaseModel):
     text: str
@@ -25,6 +26,11 @@ class CommentRetrieve(BaseModel):
 
     class Config:
         from_attributes = True
+
+class CommentPage(BaseModel):
+    items: list[CommentRetrieve] = []
+    next_cursor: Optional[str] = None
+
 class BlogRetrieve(BaseModel):
     id: int
     slug: str 
@@ -38,6 +44,35 @@ class BlogRetrieve(BaseModel):
     comments: list[CommentRetrieve] = []
     likes_count: int = 0
 
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[Dict[str, Dict[str, str]]]:
+        return storage.variant_urls(str(self.image))
+
+    class Config:
+        from_attributes = True
+
+class BlogSummary(BaseModel):
+    """Listing projection of a blog: no body, no comments."""
+    id: int
+    slug: str
+    date_added: datetime
+    title: str
+    excerpt: Optional[str] = None
+    tag: str
+    reading_time: int
+    members_only: bool
+    image: HttpUrl
+    likes_count: int = 0
+    comments_count: int = 0
+    snippet: Optional[str] = None
+
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Resized thumbnail/card/hero URLs, so listings skip the full image."""
+        return storage.variant_urls(str(self.image))
+
     class Config:
         from_attributes = True
 
@@ -53,4 +88,16 @@ class BlogCreate(BaseModel):
     image: str
 
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+class BlogImport(BlogCreate):
+    """One line of an NDJSON import; keeps the original publish date if given."""
+    date_added: Optional[datetime] = None
+
+class ImportLineError(BaseModel):
+    line: int
+    detail: str
+
+class ImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportLineError] = []
@@ -0,0 +1,239 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, or_, tuple_, update
+from sqlalchemy.orm import Session, defer
+from core.models.blogs import Blog, Comment, Like
+from core.models.users import User
+from core.schemas.blogs import BlogRetrieve, CommentPage, CommentRetrieve
+from core.utils.pagination import encode_cursor
+
+
+def load_blog_detail(db: Session, slug: str) -> Optional[Tuple[Blog, BlogRetrieve]]:
+    """Build the blog detail payload in a fixed number of statements.
+
+    One query fetches the blog, a second fetches every comment together with
+    its author picture, so the cost no longer grows with the number of
+    comments. Like counts come from the denormalized counter columns.
+    Returns the blog row alongside the payload so callers can read its
+    version stamp.
+    """
+    blog = db.scalars(select(Blog).where(Blog.slug == slug)).first()
+    if blog is None:
+        return None
+
+    rows = db.execute(
+        select(Comment, User.picture)
+        .outerjoin(User, User.id == Comment.user_id)
+        .where(Comment.blog_id == blog.id)
+        .order_by(Comment.date_added, Comment.id)
+    ).all()
+
+    comments = [
+        CommentRetrieve(
+            id=comment.id,
+            text=comment.text,
+            date_added=comment.date_added,
+            user_id=comment.user_id,
+            blog_id=comment.blog_id,
+            author=comment.author,
+            author_picture=author_picture,
+            liked=False,  # This will be updated based on current user
+            likes_count=comment.likes_count
+        )
+        for comment, author_picture in rows
+    ]
+
+    return blog, BlogRetrieve(
+        id=blog.id,
+        slug=blog.slug,
+        date_added=blog.date_added,
+        title=blog.title,
+        description=blog.description,
+        tag=blog.tag,
+        reading_time=blog.reading_time,
+        members_only=blog.members_only,
+        image=blog.image,
+        comments=comments,
+        likes_count=blog.likes_count
+    )
+
+def load_blog_stamp(db: Session, slug: str):
+    """Fetch only the columns needed to validate cached copies of a blog.
+
+    Returns a row with `id`, `version`, `date_last_updated` and
+    `likes_count`, or None when the slug does not exist.
+    """
+    return db.execute(
+        select(Blog.id, Blog.version, Blog.date_last_updated, Blog.likes_count)
+        .where(Blog.slug == slug)
+    ).first()
+
+
+def load_blog_page(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    before: Optional[Tuple[datetime, int]] = None
+) -> Tuple[List[Blog], Optional[str]]:
+    """Return one page of blogs, newest first, and the cursor of the next page.
+
+    With `before` set the page is located by the `(date_added, id)` keyset,
+    which the `ix_blogs_date_added_id` index answers without walking the
+    skipped rows; otherwise the legacy `skip` offset is applied. The body
+    column is never loaded.
+    """
+    query = select(Blog).options(defer(Blog.description, raiseload=True))
+    if before is not None:
+        query = query.where(tuple_(Blog.date_added, Blog.id) < tuple_(*before))
+    else:
+        query = query.offset(skip)
+
+    blogs = db.scalars(
+        query.order_by(Blog.date_added.desc(), Blog.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if limit > 0 and len(blogs) > limit:
+        blogs = blogs[:limit]
+        last = blogs[-1]
+        next_cursor = encode_cursor(last.date_added, last.id)
+    # The extra row fetched to detect a next page is never part of it
+    return blogs[:max(limit, 0)], next_cursor
+
+
+def load_user_blogs(db: Session, user_id: int) -> List[Blog]:
+    """All blogs written by a user, newest first, without their bodies."""
+    return db.scalars(
+        select(Blog)
+        .options(defer(Blog.description, raiseload=True))
+        .where(Blog.user_id == user_id)
+        .order_by(Blog.date_added.desc(), Blog.id.desc())
+    ).all()
+
+
+def load_comment_page(
+    db: Session,
+    blog_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None
+) -> CommentPage:
+    """Return one keyset page of comments ordered by `(date_added, id)`.
+
+    Authors are hydrated for the whole page with one batched query, so the
+    cost of a page depends only on `limit`.
+    """
+    query = select(Comment).where(Comment.blog_id == blog_id)
+    if after is not None:
+        query = query.where(tuple_(Comment.date_added, Comment.id) > tuple_(*after))
+    comments = db.scalars(
+        query.order_by(Comment.date_added, Comment.id).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        last = comments[-1]
+        next_cursor = encode_cursor(last.date_added, last.id)
+
+    user_ids = {comment.user_id for comment in comments}
+    authors = {}
+    if user_ids:
+        authors = {
+            user.id: user
+            for user in db.scalars(select(User).where(User.id.in_(user_ids)))
+        }
+
+    items = []
+    for comment in comments:
+        author = authors.get(comment.user_id)
+        items.append(CommentRetrieve(
+            id=comment.id,
+            text=comment.text,
+            date_added=comment.date_added,
+            user_id=comment.user_id,
+            blog_id=comment.blog_id,
+            author=author.username if author else "Unknown",
+            author_picture=author.picture if author else "",
+            liked=False,  # Default to False for public access
+            likes_count=comment.likes_count
+        ))
+
+    return CommentPage(items=items, next_cursor=next_cursor)
+
+
+def adjust_counter(db: Session, column, row_id: int, delta: int) -> int:
+    """Atomically add `delta` to a counter column and return the new value.
+
+    `column` is a mapped counter such as `Blog.likes_count`. The change is a
+    single `UPDATE ... SET n = n + delta` so concurrent writers never lose
+    increments; it joins the caller's transaction. Blog counters also bump
+    the blog's version stamp in the same statement.
+    """
+    model = column.class_
+    values = {column.key: column + delta}
+    if model is Blog:
+        values["version"] = Blog.version + 1
+    return db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values(values)
+        .returning(column)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+
+def touch_blog(db: Session, blog_id: int) -> None:
+    """Bump a blog's version stamp after a change to its comments or their likes."""
+    db.execute(
+        update(Blog)
+        .where(Blog.id == blog_id)
+        .values(version=Blog.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_reading_time(db: Session, words_per_minute: int) -> int:
+    """Recompute every stored reading time from the stored word counts.
+
+    Needed only after changing `READING_SPEED_WPM`; a single UPDATE that never
+    touches the article bodies. Returns the number of changed rows; the caller
+    commits.
+    """
+    minutes = (Blog.word_count + words_per_minute - 1) // words_per_minute
+    result = db.execute(
+        update(Blog)
+        .where(Blog.reading_time != minutes)
+        .values(reading_time=minutes)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def repair_counters(db: Session) -> dict:
+    """Recompute every denormalized counter and fix the rows that drifted.
+
+    Returns the number of repaired rows per table. The caller commits.
+    """
+    blog_likes = (
+        select(func.count(Like.id)).where(Like.blog_id == Blog.id).scalar_subquery()
+    )
+    blog_comments = (
+        select(func.count(Comment.id)).where(Comment.blog_id == Blog.id).scalar_subquery()
+    )
+    comment_likes = (
+        select(func.count(Like.id)).where(Like.comment_id == Comment.id).scalar_subquery()
+    )
+
+    blogs = db.execute(
+        update(Blog)
+        .where(or_(Blog.likes_count != blog_likes, Blog.comments_count != blog_comments))
+        .values(likes_count=blog_likes, comments_count=blog_comments)
+        .execution_options(synchronize_session=False)
+    )
+    comments = db.execute(
+        update(Comment)
+        .where(Comment.likes_count != comment_likes)
+        .values(likes_count=comment_likes)
+        .execution_options(synchronize_session=False)
+    )
+    return {"blogs": blogs.rowcount, "comments": comments.rowcount}
@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from sqlalchemy import select
+import core.db
+from core.config.settings import settings
+from core.models.blogs import Blog, Comment, Like
+
+# table -> (model, columns in export order, watermark column or None).
+# Incremental exports carry inserted and updated rows only: deleted blogs
+# and comments, and removed likes, leave nothing behind to export, so a
+# mirror must be reconciled against a periodic full export.
+EXPORT_TABLES = {
+    "blogs": (
+        Blog,
+        ("id", "slug", "title", "description", "excerpt", "tag", "members_only", "image",
+         "word_count", "reading_time", "likes_count", "comments_count", "user_id",
+         "date_added", "date_last_updated"),
+        Blog.date_last_updated,
+    ),
+    "comments": (
+        Comment,
+        ("id", "blog_id", "user_id", "author", "text", "likes_count", "date_added", "date_last_updated"),
+        Comment.date_last_updated,
+    ),
+    # Likes carry no timestamp, so they are always exported in full
+    "likes": (Like, ("id", "user_id", "blog_id", "comment_id"), None),
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def next_watermark() -> datetime:
+    """The `since` for the export after one starting now.
+
+    Timestamps are taken when a row is written but become visible at commit,
+    so a row stamped just before an export may commit after it has read
+    past. Backing off by EXPORT_WATERMARK_LAG_SECONDS re-exports that window
+    next time; consumers upsert by id, so the overlap is harmless.
+    """
+    return datetime.utcnow() - timedelta(seconds=settings.EXPORT_WATERMARK_LAG_SECONDS)
+
+
+def is_incremental(table: str, since: Optional[datetime]) -> bool:
+    return since is not None and EXPORT_TABLES[table][2] is not None
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_export_rows(table: str, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[tuple]:
+    """Yield the rows of `table` in id order without loading the table.
+
+    Uses its own session so it can outlive the request that started it.
+    `yield_per` turns on server-side cursors where the driver has them
+    (psycopg2 named cursors) and fetches `batch_size` rows at a time.
+    """
+    model, columns, watermark = EXPORT_TABLES[table]
+    stmt = select(*(getattr(model, column) for column in columns)).order_by(model.id)
+    if since is not None and watermark is not None:
+        stmt = stmt.where(watermark >= since)
+
+    db = core.db.SessionLocal()
+    try:
+        for row in db.execute(stmt.execution_options(yield_per=batch_size)):
+            yield tuple(_value(value) for value in row)
+    finally:
+        db.close()
+
+
+def iter_export(
+    table: str,
+    fmt: str = "ndjson",
+    since: Optional[datetime] = None,
+    compress: bool = False,
+    batch_size: int = 1000
+) -> Iterator[bytes]:
+    """Encode `table` as NDJSON or CSV, optionally gzipped, in bounded chunks.
+
+    Rows are buffered up to `batch_size` at a time, so memory stays flat
+    whatever the table size. Blocking; `StreamingResponse` runs sync
+    iterators in the threadpool.
+    """
+    _, columns, _ = EXPORT_TABLES[table]
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    pending = 0
+    for row in iter_export_rows(table, since, batch_size):
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            chunk = drain()
+            if chunk:
+                yield chunk
+            pending = 0
+
+    tail = drain()
+    if compressor is not None:
+        tail += compressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+from typing import TYPE_CHECKING, Dict, Optional
+from cachetools import TTLCache
+from core.config.settings import settings
+from core.utils.metrics import observe_outbound
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class GoogleTokenError(Exception):
+    """Google rejected the access token."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Failed to verify Google token: {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+class GoogleUnavailableError(Exception):
+    """Google could not be reached."""
+
+
+class GoogleTokenVerifier:
+    """Resolve Google OAuth access tokens to userinfo without blocking the loop.
+
+    One pooled `httpx.AsyncClient` is shared for the app's lifetime, at most
+    `max_concurrency` calls are in flight, concurrent lookups of the same
+    token share one request, and successful results are cached briefly so
+    retries and double submits do not reach Google again.
+    """
+
+    def __init__(
+        self,
+        userinfo_url: str,
+        timeout: float,
+        max_concurrency: int,
+        cache_ttl: float,
+        cache_size: int,
+        transport: Optional["httpx.AsyncBaseTransport"] = None
+    ):
+        self.userinfo_url = userinfo_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def startup(self) -> None:
+        if self._client is None:
+            # Imported on first use; httpx is one of the slower imports at cold start
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                transport=self._transport
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+        self._cache.clear()
+
+    async def verify(self, token: str) -> dict:
+        """Return Google's userinfo for `token`.
+
+        Raises `GoogleTokenError` when Google rejects the token and
+        `GoogleUnavailableError` when Google cannot be reached.
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            user_data = await self._fetch(token)
+            self._cache[key] = user_data
+            future.set_result(user_data)
+            return user_data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _fetch(self, token: str) -> dict:
+        import httpx
+
+        await self.startup()
+        async with self._semaphore:
+            try:
+                with observe_outbound("google", "userinfo"):
+                    response = await self._client.get(
+                        self.userinfo_url,
+                        params={"access_token": token}
+                    )
+            except httpx.RequestError as e:
+                raise GoogleUnavailableError(str(e)) from e
+        if response.status_code != 200:
+            raise GoogleTokenError(response.status_code, response.text)
+        return response.json()
+
+
+google_verifier = GoogleTokenVerifier(
+    userinfo_url=settings.GOOGLE_USERINFO_URL,
+    timeout=settings.GOOGLE_HTTP_TIMEOUT_SECONDS,
+    max_concurrency=settings.GOOGLE_MAX_CONCURRENCY,
+    cache_ttl=settings.GOOGLE_TOKEN_CACHE_TTL_SECONDS,
+    cache_size=settings.GOOGLE_TOKEN_CACHE_SIZE,
+)
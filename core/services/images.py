@@ -0,0 +1,54 @@
+import io
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+from core.config.settings import settings
+
+# name -> (width, height, crop to fill); uncropped variants only ever shrink
+IMAGE_VARIANTS: Dict[str, Tuple[int, int, bool]] = {
+    "thumbnail": (160, 160, True),
+    "card": (640, 360, True),
+    "hero": (1600, 900, False),
+}
+
+# format -> (Pillow encoder, file extension)
+VARIANT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+
+def render_variants(
+    source: BinaryIO,
+    wanted: Optional[Iterable[Tuple[str, str]]] = None
+) -> Iterator[Tuple[str, str, bytes]]:
+    """Yield (variant, format, encoded bytes) for each requested pair.
+
+    The source is decoded once. Blocking; call it from a worker thread.
+    """
+    # Pillow is only needed where variants are rendered locally
+    from PIL import Image, ImageOps
+
+    if wanted is None:
+        wanted = [(variant, fmt) for variant in IMAGE_VARIANTS for fmt in VARIANT_FORMATS]
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    for variant, fmt in wanted:
+        width, height, crop = IMAGE_VARIANTS[variant]
+        if crop:
+            resized = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+        encoder, _ = VARIANT_FORMATS[fmt]
+        if encoder == "JPEG" and resized.mode not in ("RGB", "L"):
+            resized = resized.convert("RGB")
+        elif resized.mode not in ("RGB", "RGBA", "L"):
+            resized = resized.convert("RGBA")
+
+        buffer = io.BytesIO()
+        resized.save(buffer, encoder, quality=settings.IMAGE_VARIANT_QUALITY)
+        yield variant, fmt, buffer.getvalue()
+
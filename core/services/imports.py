@@ -0,0 +1,188 @@
+import json
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from slugify import slugify
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.config.settings import settings
+from core.models.blogs import Blog
+from core.schemas.blogs import BlogImport, ImportLineError, ImportReport
+from core.services.uploads import adjust_upload_refs
+from core.utils.text import count_words, make_excerpt, reading_time
+
+
+def blog_row(blog: BlogImport, user_id: int) -> dict:
+    """Column values for a bulk INSERT.
+
+    Bulk inserts skip `Blog.__init__` and its validators, so the slug and
+    the description-derived columns are filled in here.
+    """
+    word_count = count_words(blog.description)
+    return {
+        "title": blog.title,
+        "slug": slugify(blog.title) or "post",
+        "description": blog.description,
+        "excerpt": make_excerpt(blog.description),
+        "word_count": word_count,
+        "reading_time": reading_time(word_count, settings.READING_SPEED_WPM),
+        "tag": blog.tag,
+        "members_only": blog.members_only,
+        "image": blog.image,
+        "date_added": blog.date_added or datetime.utcnow(),
+        "user_id": user_id,
+    }
+
+
+class SlugAllocator:
+    """Hands out unique slugs (`my-post`, `my-post-2`, ...) across an import.
+
+    The database is asked about each base slug once per import: an indexed
+    IN query for the exact slugs of a batch, and a prefix query only for
+    bases that actually collide. Everything learned is kept, so repeated
+    titles cost set lookups rather than table scans.
+    """
+
+    def __init__(self):
+        self.taken = set()
+        self._checked = set()
+        self._loaded = set()
+        self._next_suffix = {}
+
+    def assign(self, db: Session, rows: List[dict]) -> None:
+        unchecked = {row["slug"] for row in rows} - self._checked
+        if unchecked:
+            self.taken.update(db.scalars(select(Blog.slug).where(Blog.slug.in_(unchecked))))
+            self._checked |= unchecked
+
+        seen = Counter(row["slug"] for row in rows)
+        colliding = {
+            base for base, n in seen.items()
+            if (base in self.taken or n > 1) and base not in self._loaded
+        }
+        if colliding:
+            # Slugs only contain [a-z0-9-], so they need no LIKE escaping
+            self.taken.update(db.scalars(
+                select(Blog.slug).where(or_(*(Blog.slug.like(f"{base}-%") for base in colliding)))
+            ))
+            self._loaded |= colliding
+
+        for row in rows:
+            base = row["slug"]
+            if base not in self.taken:
+                self.taken.add(base)
+                continue
+            suffix = self._next_suffix.get(base, 2)
+            while f"{base}-{suffix}" in self.taken:
+                suffix += 1
+            row["slug"] = f"{base}-{suffix}"
+            self.taken.add(row["slug"])
+            self._next_suffix[base] = suffix + 1
+
+
+class BlogImporter:
+    """Validates NDJSON lines as blogs and inserts them in batches.
+
+    Feed it lines with `feed`; whenever it returns True a batch is ready and
+    the caller runs `flush` with a session (directly, or through `run_db`
+    from an async route). Bad lines are recorded and skipped; they never
+    abort the import.
+    """
+
+    def __init__(self, user_id: int, batch_size: int = None, max_reported_errors: int = None):
+        self.user_id = user_id
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_reported_errors = max_reported_errors or settings.IMPORT_MAX_REPORTED_ERRORS
+        self.report = ImportReport()
+        self._pending: List[Tuple[int, dict]] = []
+        self._slugs = SlugAllocator()
+
+    def feed(self, line_no: int, line: Union[str, bytes]) -> bool:
+        if not line.strip():
+            return False
+        try:
+            blog = BlogImport.model_validate(json.loads(line))
+        except ValueError as e:
+            # json.JSONDecodeError and ValidationError are both ValueErrors
+            detail = json.dumps(e.errors(include_url=False), default=str) if isinstance(e, ValidationError) else str(e)
+            self._fail(line_no, detail)
+            return False
+        self._pending.append((line_no, blog_row(blog, self.user_id)))
+        return len(self._pending) >= self.batch_size
+
+    def flush(self, db: Session) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        rows = [row for _, row in pending]
+        self._slugs.assign(db, rows)
+        try:
+            # One executemany for the whole batch
+            db.execute(insert(Blog), rows)
+            self._count_images(db, rows)
+            db.commit()
+            self.report.imported += len(rows)
+        except IntegrityError:
+            # A concurrent writer took a slug; forget what we knew and retry
+            # row by row so only the offending lines fail
+            db.rollback()
+            self._slugs = SlugAllocator()
+            for line_no, row in pending:
+                self._insert_one(db, line_no, row)
+
+    def _insert_one(self, db: Session, line_no: int, row: dict) -> None:
+        row["slug"] = slugify(row["title"]) or "post"
+        self._slugs.assign(db, [row])
+        try:
+            db.execute(insert(Blog), [row])
+            self._count_images(db, [row])
+            db.commit()
+            self.report.imported += 1
+        except IntegrityError as e:
+            db.rollback()
+            self._fail(line_no, str(e.orig))
+
+    def _count_images(self, db: Session, rows: List[dict]) -> None:
+        for image, count in Counter(row["image"] for row in rows).items():
+            adjust_upload_refs(db, image, count)
+
+    def _fail(self, line_no: int, detail: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_reported_errors:
+            self.report.errors.append(ImportLineError(line=line_no, detail=detail))
+
+
+class ImportTooLarge(Exception):
+    """The import body, or one of its lines, went over its byte limit."""
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes],
+    max_bytes: Optional[int] = None,
+    max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a streamed body into numbered lines without buffering all of it.
+
+    Raises `ImportTooLarge` as soon as more than `max_bytes` arrived, or a
+    line grows past `max_line_bytes`, before that line is buffered in full.
+    """
+    buffer = b""
+    line_no = 0
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if max_bytes is not None and received > max_bytes:
+            raise ImportTooLarge(f"Import exceeds {max_bytes} bytes")
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if max_line_bytes is not None and len(line) > max_line_bytes:
+                raise ImportTooLarge(f"Line {line_no} exceeds {max_line_bytes} bytes")
+            yield line_no, line
+        if max_line_bytes is not None and len(buffer) > max_line_bytes:
+            raise ImportTooLarge(f"Line {line_no + 1} exceeds {max_line_bytes} bytes")
+    if buffer:
+        yield line_no + 1, buffer
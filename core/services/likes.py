@@ -0,0 +1,397 @@
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, exists, func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from core.config.settings import settings
+import core.db
+from core.db import run_db
+from core.models.blogs import Blog, Comment, Like
+from core.services.blogs import adjust_counter, touch_blog
+from core.utils.cache import BLOG_LIST_TAG, blog_tag, response_cache
+
+# ("blog", blog_id) or ("comment", comment_id)
+Target = Tuple[str, int]
+
+Counted = TypeVar("Counted")
+
+
+class LikeState(NamedTuple):
+    target_id: int
+    blog_id: int
+    likes_count: int
+    liked: bool
+
+
+def load_like_state(db: Session, user_id: int, slug: str, comment_id: Optional[int] = None) -> Optional[LikeState]:
+    """Counter and the user's like for a blog or one of its comments, in one query."""
+    if comment_id is None:
+        liked = exists().where(Like.user_id == user_id, Like.blog_id == Blog.id)
+        row = db.execute(
+            select(Blog.id, Blog.id, Blog.likes_count, liked).where(Blog.slug == slug)
+        ).first()
+    else:
+        liked = exists().where(Like.user_id == user_id, Like.comment_id == Comment.id)
+        row = db.execute(
+            select(Comment.id, Blog.id, Comment.likes_count, liked)
+            .join(Blog, Blog.id == Comment.blog_id)
+            .where(Blog.slug == slug, Comment.id == comment_id)
+        ).first()
+    return LikeState(*row) if row is not None else None
+
+
+def insert_like(db: Session):
+    """`INSERT INTO likes` that supports `on_conflict_do_nothing` on this database."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(Like)
+
+
+def toggle_like(db: Session, user_id: int, column, target_id: int, blog_id: int) -> Tuple[bool, int]:
+    """Flip a like without a read-then-write race; returns (liked, likes_count).
+
+    `column` is `Like.blog_id` or `Like.comment_id`. The unique indexes on
+    likes make `INSERT ... ON CONFLICT DO NOTHING` the arbiter between
+    concurrent toggles. PostgreSQL does the delete, insert and counter
+    update in a single statement; SQLite, lacking data-modifying CTEs, uses
+    `DELETE ... RETURNING`, then the guarded insert only if nothing was
+    deleted, then the counter update. Joins the caller's transaction.
+
+    Concurrent toggles of the same (user, target) wait on each other's like
+    row. Two racing likes leave one like (both report liked, the loser
+    without changing the count); an unlike racing a like applies in commit
+    order. Either way the counter moves only by rows actually changed.
+    """
+    counter = Blog.likes_count if column is Like.blog_id else Comment.likes_count
+    match = and_(Like.user_id == user_id, column == target_id)
+
+    if db.get_bind().dialect.name == "postgresql":
+        deleted = delete(Like).where(match).returning(Like.id).cte("deleted")
+        inserted = (
+            insert_like(db)
+            .from_select(
+                ["user_id", column.key],
+                select(literal(user_id), literal(target_id)).where(~exists(select(deleted.c.id)))
+            )
+            .on_conflict_do_nothing()
+            .returning(Like.id)
+            .cte("inserted")
+        )
+        delta = (
+            select(func.count()).select_from(inserted).scalar_subquery()
+            - select(func.count()).select_from(deleted).scalar_subquery()
+        )
+        model = counter.class_
+        # onupdate defaults are not applied inside CTEs, so the stamp is explicit
+        now = datetime.utcnow()
+        values = {counter.key: counter + delta, "date_last_updated": now}
+        if model is Blog:
+            values["version"] = Blog.version + 1
+        counted = (
+            update(model)
+            .where(model.id == target_id)
+            .values(values)
+            .returning(counter)
+            .cte("counted")
+        )
+        outputs = [
+            select(func.count()).select_from(deleted).scalar_subquery(),
+            select(counted.c[counter.key]).scalar_subquery(),
+        ]
+        if model is Comment:
+            # A statement may update a row only once, so the blog's version
+            # stamp gets its own CTE only when the counter lives on comments
+            bumped = (
+                update(Blog)
+                .where(Blog.id == blog_id)
+                .values(version=Blog.version + 1, date_last_updated=now)
+                .returning(Blog.id)
+                .cte("bumped")
+            )
+            outputs.append(select(func.count()).select_from(bumped).scalar_subquery())
+        row = db.execute(select(*outputs).execution_options(synchronize_session=False)).one()
+        return row[0] == 0, row[1]
+
+    removed = db.execute(
+        delete(Like).where(match).returning(Like.id).execution_options(synchronize_session=False)
+    ).first()
+    if removed is not None:
+        delta = -1
+    else:
+        added = db.execute(
+            insert_like(db)
+            .values({"user_id": user_id, column.key: target_id})
+            .on_conflict_do_nothing()
+            .returning(Like.id)
+        ).first()
+        # Lost a race to an identical toggle: the like exists, nothing to count
+        delta = 1 if added is not None else 0
+    if delta:
+        likes_count = adjust_counter(db, counter, target_id, delta)
+        if column is Like.comment_id:
+            touch_blog(db, blog_id)
+    else:
+        likes_count = db.scalar(select(counter).where(counter.class_.id == target_id))
+    return removed is None, likes_count
+
+
+class LikeBuffer:
+    """Write-behind buffer for like toggles.
+
+    Toggles change in-memory state and return at once; repeated toggles of
+    the same (user, target) coalesce, so a double tap writes nothing. A
+    background task flushes the net changes in one transaction every
+    `flush_interval` seconds, or sooner once `max_pending` toggles wait.
+    While a target has unflushed toggles its count is served from memory;
+    once it is clean again it is dropped and re-read from the database.
+
+    Unflushed toggles live only in this worker: a graceful shutdown drains
+    them, a hard crash loses at most one interval's worth.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # (user_id, target) -> (wanted state, state in the database)
+        self._likes: Dict[Tuple[int, Target], Tuple[bool, bool]] = {}
+        self._counts: Dict[Target, int] = {}
+        self._users: Dict[Target, Set[int]] = {}
+        # target -> id of its blog (not the slug, which may change before a flush)
+        self._blogs: Dict[Target, int] = {}
+        self._pending = 0
+        # Bumped after every flush, so readers can tell their snapshot went stale
+        self._generation = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stats = {"toggles": 0, "coalesced": 0, "flushes": 0, "rows_written": 0, "flush_failures": 0}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def toggle(self, user_id: int, kind: str, state: LikeState, generation: int) -> Optional[Tuple[bool, int]]:
+        """Flip the user's like and return (liked, likes_count).
+
+        `state` is what the database said when `generation` was current.
+        Returns None when a flush finished in between and this user's like is
+        not buffered, meaning `state` may predate that flush; re-read and retry.
+        """
+        target = (kind, state.target_id)
+        key = (user_id, target)
+        with self._lock:
+            if key not in self._likes:
+                if generation != self._generation:
+                    return None
+                self._likes[key] = (state.liked, state.liked)
+                self._users.setdefault(target, set()).add(user_id)
+                self._counts.setdefault(target, state.likes_count)
+                self._blogs[target] = state.blog_id
+
+            wanted, persisted = self._likes[key]
+            wanted = not wanted
+            self._likes[key] = (wanted, persisted)
+            self._counts[target] += 1 if wanted else -1
+            self._stats["toggles"] += 1
+            if wanted == persisted:
+                self._pending -= 1
+                self._stats["coalesced"] += 1
+            else:
+                self._pending += 1
+            likes_count = self._counts[target]
+            pending = self._pending
+
+        if pending >= self.max_pending and self._wake is not None:
+            self._wake.set()
+        return wanted, likes_count
+
+    def likes_count(self, kind: str, target_id: int) -> Optional[int]:
+        """Count including unflushed toggles, or None when the database is current."""
+        with self._lock:
+            return self._counts.get((kind, target_id))
+
+    def counts_by_blog(self) -> Dict[int, Dict[Target, int]]:
+        """Unflushed counts of each buffered blog and its comments, by blog id."""
+        with self._lock:
+            counts: Dict[int, Dict[Target, int]] = {}
+            for target, blog_id in self._blogs.items():
+                counts.setdefault(blog_id, {})[target] = self._counts[target]
+            return counts
+
+    def blog_counts(self) -> Dict[Target, int]:
+        """Unflushed counts of every buffered blog, for listings."""
+        with self._lock:
+            return {target: count for target, count in self._counts.items() if target[0] == "blog"}
+
+    def is_liked(self, user_id: int, kind: str, target_id: int) -> Optional[bool]:
+        with self._lock:
+            entry = self._likes.get((user_id, (kind, target_id)))
+            return entry[0] if entry is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "pending": self._pending, "buffered_targets": len(self._counts)}
+
+    async def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Cancel between flushes, never during one: the abandoned write
+            # would still commit in its thread, possibly after the drain below
+            async with self._flush_lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Drain what is left; a failing database gets a few more chances
+        for attempt in range(3):
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                print(f"Like buffer flush on shutdown failed (attempt {attempt + 1}): {str(e)}")
+                await asyncio.sleep(0.5)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # The batch stays buffered and is retried on the next tick
+                print(f"Like buffer flush failed: {str(e)}")
+
+    async def flush(self) -> int:
+        """Write every pending toggle in one transaction; returns rows written."""
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            with self._lock:
+                batch = [
+                    (user_id, target, wanted, self._blogs[target])
+                    for (user_id, target), (wanted, persisted) in self._likes.items()
+                    if wanted != persisted
+                ]
+            if not batch:
+                self._settle([])
+                return 0
+            try:
+                written, slugs = await run_in_threadpool(self._write, batch)
+            except Exception:
+                with self._lock:
+                    self._stats["flush_failures"] += 1
+                raise
+            response_cache.invalidate(BLOG_LIST_TAG, *(blog_tag(slug) for slug in slugs))
+            self._settle(batch)
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["rows_written"] += written
+            return written
+
+    def _write(self, batch: List[Tuple[int, Target, bool, int]]) -> Tuple[int, List[str]]:
+        """Apply `batch`; returns rows written and the current slugs of its blogs."""
+        deltas: Dict[Tuple[str, int, int], int] = {}
+        written = 0
+        db = core.db.SessionLocal()
+        try:
+            for user_id, (kind, target_id), wanted, blog_id in batch:
+                column = Like.blog_id if kind == "blog" else Like.comment_id
+                match = and_(Like.user_id == user_id, column == target_id)
+                if wanted:
+                    # A like inserted elsewhere meanwhile is skipped, not doubled
+                    result = db.execute(
+                        insert_like(db)
+                        .values({"user_id": user_id, column.key: target_id})
+                        .on_conflict_do_nothing()
+                    )
+                else:
+                    result = db.execute(delete(Like).where(match).execution_options(synchronize_session=False))
+                changed = result.rowcount or 0
+                written += changed
+                deltas[(kind, target_id, blog_id)] = deltas.get((kind, target_id, blog_id), 0) + (changed if wanted else -changed)
+
+            touched_blogs = set()
+            for (kind, target_id, blog_id), delta in deltas.items():
+                if not delta:
+                    continue
+                if kind == "blog":
+                    adjust_counter(db, Blog.likes_count, target_id, delta)
+                else:
+                    adjust_counter(db, Comment.likes_count, target_id, delta)
+                    touched_blogs.add(blog_id)
+            for blog_id in touched_blogs:
+                touch_blog(db, blog_id)
+            # Looked up now, not at toggle time, so a renamed blog's cache is dropped
+            slugs = list(db.scalars(select(Blog.slug).where(Blog.id.in_({blog_id for _, _, _, blog_id in batch}))))
+            db.commit()
+        finally:
+            db.close()
+        return written, slugs
+
+    def _settle(self, batch) -> None:
+        # Record what is now in the database and drop targets that went clean
+        with self._lock:
+            for user_id, target, wanted, _ in batch:
+                key = (user_id, target)
+                current, _ = self._likes[key]
+                self._likes[key] = (current, wanted)
+            for target in list(self._counts):
+                users = self._users[target]
+                if all(self._likes[(user_id, target)][0] == self._likes[(user_id, target)][1] for user_id in users):
+                    for user_id in users:
+                        del self._likes[(user_id, target)]
+                    del self._users[target], self._counts[target], self._blogs[target]
+            self._pending = sum(1 for wanted, persisted in self._likes.values() if wanted != persisted)
+            self._generation += 1
+
+
+like_buffer = LikeBuffer(
+    flush_interval=settings.LIKE_BUFFER_FLUSH_SECONDS,
+    max_pending=settings.LIKE_BUFFER_MAX_PENDING,
+)
+
+
+async def toggle_like_buffered(db, user_id: int, slug: str, comment_id: Optional[int] = None) -> Tuple[bool, int]:
+    """Toggle through `like_buffer`: one read query, no write on the request path."""
+    kind = "blog" if comment_id is None else "comment"
+    while True:
+        generation = like_buffer.generation
+        state = await run_db(db, load_like_state, user_id, slug, comment_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Blog not found" if comment_id is None else "Comment not found")
+        result = like_buffer.toggle(user_id, kind, state, generation)
+        if result is not None:
+            return result
+
+
+def with_buffered_counts(items: Sequence[Counted], kind: str, counts: Dict[Target, int]) -> List[Counted]:
+    """Copies of `items` (schemas with `id` and `likes_count`) showing unflushed toggles.
+
+    Read the counts before querying the rows: a flush that lands in between
+    then only makes the overlay redundant, never the rows stale.
+    """
+    return [
+        item.model_copy(update={"likes_count": counts[(kind, item.id)]}) if (kind, item.id) in counts else item
+        for item in items
+    ]
+
+
+def buffered_variant(counts: Dict[Target, int]) -> Optional[str]:
+    # ETag variant for representations overlaid with unflushed counts, which
+    # the version stamp does not cover until the flush
+    if not counts:
+        return None
+    return "b" + hashlib.sha256(repr(sorted(counts.items())).encode()).hexdigest()[:12]
@@ -0,0 +1,87 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, or_, literal_column, table, column
+from sqlalchemy.orm import Session, defer
+from core.models.blogs import Blog
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+blogs_fts = table("blogs_fts", column("rowid"))
+
+# Hits are rendered as summaries; never pull article bodies into Python
+_skip_body = defer(Blog.description, raiseload=True)
+
+
+def _fts5_query(term: str) -> str:
+    # Quote every token so user input is never parsed as FTS5 syntax
+    tokens = term.split()
+    return " ".join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+
+
+def _postgres_search(db: Session, term: str, offset: int, limit: int):
+    vector = literal_column("blogs.search_vector")
+    query = func.websearch_to_tsquery("english", term)
+    snippet = func.ts_headline(
+        "english",
+        Blog.description,
+        query,
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=35, MinWords=15"
+    )
+    return db.execute(
+        select(Blog, snippet)
+        .options(_skip_body)
+        .where(vector.op("@@")(query))
+        .order_by(func.ts_rank_cd(vector, query).desc(), Blog.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+
+
+def _sqlite_search(db: Session, term: str, offset: int, limit: int):
+    match = _fts5_query(term)
+    if not match:
+        return []
+    fts = literal_column("blogs_fts")
+    snippet = func.snippet(fts, 1, HIGHLIGHT_START, HIGHLIGHT_END, "…", 24)
+    return db.execute(
+        select(Blog, snippet)
+        .options(_skip_body)
+        .join(blogs_fts, blogs_fts.c.rowid == Blog.id)
+        .where(fts.op("MATCH")(match))
+        # bm25 scores are negative; lower is more relevant. Title hits weigh more.
+        .order_by(func.bm25(fts, 10.0, 1.0), Blog.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+
+
+def _fallback_search(db: Session, term: str, offset: int, limit: int):
+    pattern = f"%{term}%"
+    blogs = db.scalars(
+        select(Blog)
+        .options(_skip_body)
+        .where(or_(Blog.title.ilike(pattern), Blog.description.ilike(pattern)))
+        .order_by(Blog.date_added.desc(), Blog.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    return [(blog, None) for blog in blogs]
+
+
+_BACKENDS = {
+    "postgresql": _postgres_search,
+    "sqlite": _sqlite_search,
+}
+
+
+def search_blogs(
+    db: Session, term: str, offset: int = 0, limit: int = 10
+) -> List[Tuple[Blog, Optional[str]]]:
+    """Full-text search over blog titles and descriptions, best match first.
+
+    Returns `(blog, snippet)` pairs where the snippet is a short excerpt of the
+    description with matches wrapped in `<mark>` tags. The backend is picked
+    from the bound database dialect.
+    """
+    backend = _BACKENDS.get(db.get_bind().dialect.name, _fallback_search)
+    return backend(db, term, offset, limit)
@@ -0,0 +1,167 @@
+import os
+import re
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Optional
+from urllib.parse import urlsplit
+from core.config.settings import settings
+from core.services.images import IMAGE_VARIANTS, VARIANT_FORMATS, render_variants
+from core.utils.metrics import observe_outbound
+from core.utils.uploads import IMAGE_EXTENSIONS
+
+
+class StorageBackend(ABC):
+    """Where uploaded media ends up.
+
+    `save` and `save_variants` are blocking and are always called from a
+    worker thread, never from the event loop.
+    """
+
+    @abstractmethod
+    def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        """Store `fileobj` under `key` and return its public URL."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the file stored under `key` along with its variants."""
+
+    def save_variants(self, fileobj: BinaryIO, key: str) -> None:
+        """Pre-render resized variants of the image stored under `key`."""
+
+    def variant_url(self, url: str, variant: str, fmt: str) -> Optional[str]:
+        """URL of one variant of a stored image, or None if not derivable."""
+        return None
+
+    def variant_urls(self, url: Optional[str]) -> Optional[Dict[str, Dict[str, str]]]:
+        """All variant URLs for `url`, e.g. `{"card": {"webp": ..., "jpeg": ...}}`.
+
+        Images the backend cannot derive from (external URLs) map every
+        variant back to the original, so clients can always use the field.
+        """
+        if not url:
+            return None
+        return {
+            variant: {fmt: self.variant_url(url, variant, fmt) or url for fmt in VARIANT_FORMATS}
+            for variant in IMAGE_VARIANTS
+        }
+
+
+class CloudinaryStorage(StorageBackend):
+    """Cloudinary renders variants itself on first request and caches them."""
+
+    UPLOAD_SEGMENT = "/image/upload/"
+
+    def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        import cloudinary.uploader
+
+        public_id, _ = os.path.splitext(key)
+        with observe_outbound("cloudinary", "upload"):
+            result = cloudinary.uploader.upload(fileobj, public_id=public_id, resource_type="image")
+        return result["secure_url"]
+
+    def delete(self, key: str) -> None:
+        import cloudinary.uploader
+
+        public_id, _ = os.path.splitext(key)
+        # Also purges the derived variants from Cloudinary's CDN
+        with observe_outbound("cloudinary", "destroy"):
+            cloudinary.uploader.destroy(public_id, resource_type="image", invalidate=True)
+
+    def variant_url(self, url: str, variant: str, fmt: str) -> Optional[str]:
+        if "res.cloudinary.com" not in url or self.UPLOAD_SEGMENT not in url:
+            return None
+        width, height, crop = IMAGE_VARIANTS[variant]
+        mode = "c_fill,g_auto" if crop else "c_limit"
+        _, extension = VARIANT_FORMATS[fmt]
+        transformation = f"{mode},w_{width},h_{height},f_{extension},q_auto"
+        return url.replace(self.UPLOAD_SEGMENT, f"{self.UPLOAD_SEGMENT}{transformation}/", 1)
+
+
+class LocalStorage(StorageBackend):
+    """Files under `root`, for development and tests.
+
+    Variants live at `variants/<source stem>/<variant>.<ext>`; since upload
+    keys are content hashes, each is cached by source hash and size.
+    """
+
+    STEM_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+
+    def save(self, fileobj: BinaryIO, key: str, content_type: str) -> str:
+        self._write(key, lambda out: shutil.copyfileobj(fileobj, out))
+        return self.base_url + key
+
+    def delete(self, key: str) -> None:
+        stem, _ = os.path.splitext(key)
+        try:
+            os.remove(os.path.join(self.root, key))
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(os.path.join(self.root, "variants", stem), ignore_errors=True)
+
+    def save_variants(self, fileobj: BinaryIO, key: str) -> None:
+        stem, _ = os.path.splitext(key)
+        for variant, fmt, data in render_variants(fileobj):
+            self._write(self.variant_key(stem, variant, fmt), lambda out: out.write(data))
+
+    def variant_key(self, stem: str, variant: str, fmt: str) -> str:
+        _, extension = VARIANT_FORMATS[fmt]
+        return f"variants/{stem}/{variant}.{extension}"
+
+    def variant_url(self, url: str, variant: str, fmt: str) -> Optional[str]:
+        if not url.startswith(self.base_url):
+            return None
+        stem, _ = os.path.splitext(url[len(self.base_url):])
+        if not self.STEM_PATTERN.match(stem):
+            return None
+        return self.base_url + self.variant_key(stem, variant, fmt)
+
+    def ensure_variant(self, stem: str, variant: str, fmt: str) -> Optional[str]:
+        """Path of a variant file, rendering it from the source if missing."""
+        if not self.STEM_PATTERN.match(stem) or variant not in IMAGE_VARIANTS or fmt not in VARIANT_FORMATS:
+            return None
+        path = os.path.join(self.root, self.variant_key(stem, variant, fmt))
+        if os.path.exists(path):
+            return path
+        sources = (os.path.join(self.root, f"{stem}.{extension}") for extension in IMAGE_EXTENSIONS)
+        source = next((candidate for candidate in sources if os.path.exists(candidate)), None)
+        if source is None:
+            return None
+        with open(source, "rb") as fileobj:
+            for _, _, data in render_variants(fileobj, [(variant, fmt)]):
+                self._write(self.variant_key(stem, variant, fmt), lambda out: out.write(data))
+        return path
+
+    def _write(self, key: str, writer) -> str:
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the target and rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                writer(out)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+
+def get_storage() -> StorageBackend:
+    if settings.MEDIA_BACKEND == "cloudinary":
+        return CloudinaryStorage()
+    if settings.MEDIA_BACKEND == "local":
+        return LocalStorage(settings.MEDIA_ROOT, settings.MEDIA_URL)
+    raise ValueError(f"Unknown MEDIA_BACKEND: {settings.MEDIA_BACKEND}")
+
+
+storage = get_storage()
+
+
+def media_path() -> str:
+    """URL path the local backend's files are served under."""
+    return urlsplit(settings.MEDIA_URL).path.rstrip("/") or "/media"
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.models.blogs import Blog
+from core.models.uploads import Upload
+from core.services.storage import StorageBackend
+from core.utils.uploads import UploadInfo
+
+
+def find_upload_url(db: Session, sha256: str) -> Optional[str]:
+    return db.scalars(select(Upload.url).where(Upload.sha256 == sha256)).first()
+
+
+def record_upload(db: Session, info: UploadInfo, key: str, url: str) -> str:
+    """Remember a stored file and return its canonical URL.
+
+    Two concurrent uploads of the same content both reach the backend under
+    the same key; whichever insert loses the race adopts the winner's row.
+    """
+    db.add(Upload(sha256=info.sha256, key=key, url=url, content_type=info.content_type, size=info.size))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return find_upload_url(db, info.sha256)
+    return url
+
+
+def adjust_upload_refs(db: Session, url: Optional[str], delta: int) -> None:
+    """Count a blog gaining (+1) or dropping (-1) `url` as its image.
+
+    URLs that are not uploads (external images) match nothing. Joins the
+    caller's transaction.
+    """
+    if not url:
+        return
+    db.execute(
+        update(Upload)
+        .where(Upload.url == url)
+        .values(ref_count=Upload.ref_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def collect_unused_uploads(db: Session, storage: StorageBackend, grace: timedelta) -> int:
+    """Delete uploads no blog references, once they are older than `grace`.
+
+    Reference counts are recomputed from the blogs first so drift can never
+    delete a file in use; the grace period covers images uploaded for a
+    blog that has not been saved yet. Returns the number of deleted uploads.
+    """
+    references = select(func.count(Blog.id)).where(Blog.image == Upload.url).scalar_subquery()
+    db.execute(
+        update(Upload)
+        .where(Upload.ref_count != references)
+        .values(ref_count=references)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    cutoff = datetime.utcnow() - grace
+    unused = db.execute(
+        select(Upload.id, Upload.key)
+        .where(Upload.ref_count == 0, Upload.date_added < cutoff)
+    ).all()
+    deleted = 0
+    for row in unused:
+        # Re-check inside the delete so a blog saved meanwhile keeps its image
+        result = db.execute(
+            delete(Upload)
+            .where(Upload.id == row.id, ~select(Blog.id).where(Blog.image == Upload.url).exists())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            storage.delete(row.key)
+            deleted += 1
+        db.commit()
+    return deleted
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+from cachetools import TLRUCache, TTLCache
+from core.config.settings import settings
+
+
+# Columns kept for a cached user; the refresh token stays in the database
+USER_SNAPSHOT_COLUMNS = ("id", "email", "name", "picture", "username")
+
+
+def _token_key(token: str) -> str:
+    # The whole token is hashed, not just its signature, so a forged payload
+    # reusing a valid signature can never match a cached entry
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class AuthCache:
+    """Per-worker caches that keep `get_current_user` off the hot path.
+
+    `claims` maps a verified access token to its decoded payload until the
+    token's own `exp`; `users` maps a subject (email) to a snapshot of the
+    user row for a short TTL. Writes that change a user must call
+    `invalidate_user`; other workers converge once the TTL lapses.
+    """
+
+    def __init__(self, token_size: int, user_size: int, user_ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._claims = TLRUCache(
+            maxsize=token_size,
+            ttu=lambda _key, claims, now: claims["exp"],
+            timer=time.time
+        )
+        self._users = TTLCache(maxsize=user_size, ttl=user_ttl)
+        self._stats = {
+            "token_hits": 0,
+            "token_misses": 0,
+            "user_hits": 0,
+            "user_misses": 0,
+            "user_invalidations": 0,
+        }
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            claims = self._claims.get(_token_key(token))
+            self._stats["token_hits" if claims is not None else "token_misses"] += 1
+            return claims
+
+    def set_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        # Tokens without a numeric expiry are verified every time
+        if not self.enabled or not isinstance(claims.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._claims[_token_key(token)] = claims
+
+    def get_user(self, subject: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            snapshot = self._users.get(subject)
+            self._stats["user_hits" if snapshot is not None else "user_misses"] += 1
+            return snapshot
+
+    def set_user(self, subject: str, snapshot: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._users[subject] = snapshot
+
+    def invalidate_user(self, subject: str) -> None:
+        with self._lock:
+            if self._users.pop(subject, None) is not None:
+                self._stats["user_invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._users.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                # Every user hit is a `SELECT ... FROM users` that did not run
+                "db_lookups_saved": self._stats["user_hits"],
+                "tokens": len(self._claims),
+                "users": len(self._users),
+            }
+
+
+auth_cache = AuthCache(
+    token_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    user_size=settings.AUTH_USER_CACHE_SIZE,
+    user_ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+    enabled=settings.AUTH_CACHE_ENABLED,
+)
@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Optional
+from cachetools import TTLCache
+from fastapi import Response
+from core.config.settings import settings
+from core.db.replicas import reads_pinned, reads_replica, replica_urls
+
+
+class CachedResponse:
+    """Serialized JSON body plus the headers it was produced with."""
+
+    __slots__ = ("body", "headers", "tags", "expires")
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None, tags: Iterable[str] = ()):
+        self.body = body
+        self.headers = dict(headers or {})
+        self.tags = frozenset(tags)
+        # Monotonic deadline earlier than the cache TTL, if any
+        self.expires: Optional[float] = None
+
+    def as_response(self, hit: bool) -> Response:
+        headers = dict(self.headers)
+        headers["X-Cache"] = "HIT" if hit else "MISS"
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class _ObservedTTLCache(TTLCache):
+    """TTLCache that reports evicted and expired entries to its owner."""
+
+    def __init__(self, owner: "ResponseCache", maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl, getsizeof=lambda entry: len(entry.body))
+        self._owner = owner
+
+    def popitem(self):
+        key, entry = super().popitem()
+        self._owner._forget(key, entry, "evictions")
+        return key, entry
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, entry in expired:
+            self._owner._forget(key, entry, "expirations")
+        return expired
+
+
+class ResponseCache:
+    """In-process TTL + LRU cache of serialized read responses.
+
+    Entries are bounded by the total size of their bodies and carry tags
+    (for example `blog:<slug>` or `blogs`) so writes can drop exactly the
+    responses they affect. Each worker process holds its own cache; the TTL
+    bounds how stale another worker's copy can get.
+
+    With read replicas, `replica_lag` is how long a replica may trail the
+    primary (the read-your-writes pin). Invalidated tags are remembered for
+    that long, and a response read from a replica meanwhile expires when
+    the window closes instead of after the full TTL.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, enabled: bool = True, replica_lag: float = 0, max_tags: int = 10_000):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.replica_lag = replica_lag
+        self._lock = threading.Lock()
+        self._entries = _ObservedTTLCache(self, max_bytes, ttl)
+        self._tags = defaultdict(set)
+        # tag -> monotonic time of its last invalidation, within replica_lag
+        self._written = TTLCache(maxsize=max_tags, ttl=replica_lag) if replica_lag > 0 else None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        # A client pinned to the primary after its own write must not be
+        # served an entry filled from a lagging replica
+        if not self.enabled or reads_pinned():
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= time.monotonic():
+                del self._entries[key]
+                self._forget(key, entry, "expirations")
+                entry = None
+            self._stats["hits" if entry is not None else "misses"] += 1
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        tags: Iterable[str] = ()
+    ) -> CachedResponse:
+        entry = CachedResponse(body, headers, tags)
+        if not self.enabled or len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if self._written is not None and reads_replica():
+                # The replica may not show those writes yet. Kept for the full
+                # TTL, its answer would reach the writer once the pin lapses
+                written = [self._written.get(tag) for tag in entry.tags]
+                written = [stamp for stamp in written if stamp is not None]
+                if written:
+                    entry.expires = max(written) + self.replica_lag
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._untag(key, previous)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tags[tag].add(key)
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of `tags`."""
+        with self._lock:
+            for tag in tags:
+                if self._written is not None:
+                    self._written[tag] = time.monotonic()
+                for key in self._tags.pop(tag, ()):
+                    entry = self._entries.pop(key, None)
+                    if entry is not None:
+                        self._untag(key, entry)
+                        self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._entries.currsize,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _forget(self, key: Hashable, entry: CachedResponse, reason: str) -> None:
+        # Called by the underlying cache with the lock already held
+        self._untag(key, entry)
+        self._stats[reason] += 1
+
+    def _untag(self, key: Hashable, entry: CachedResponse) -> None:
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def blog_tag(slug: str) -> str:
+    return f"blog:{slug}"
+
+
+BLOG_LIST_TAG = "blogs"
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+    replica_lag=settings.READ_YOUR_WRITES_SECONDS if replica_urls() else 0,
+)
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from fastapi import Response
+from core.config.settings import settings
+
+
+def blog_etag(kind: str, blog_id: int, version: int, *variant) -> str:
+    """Strong ETag for one representation of a blog at a given version."""
+    parts = [kind, str(blog_id), str(version), *(str(v) for v in variant if v is not None)]
+    return '"{}"'.format("-".join(parts))
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(
+    route: str, etag: str, last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    """ETag, Last-Modified and the configured Cache-Control policy for `route`."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    cache_control = settings.CACHE_CONTROL.get(route)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], headers: Mapping[str, str]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against response validators.
+
+    If-None-Match takes precedence and uses the weak comparison RFC 9110
+    prescribes for it; If-Modified-Since is only consulted without it.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    etag = headers.get("ETag")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: Mapping[str, str]) -> Response:
+    keep = ("ETag", "Last-Modified", "Cache-Control")
+    return Response(status_code=304, headers={k: v for k, v in headers.items() if k in keep})
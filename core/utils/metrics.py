@@ -0,0 +1,203 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# With PROMETHEUS_MULTIPROC_DIR set before start-up, every worker writes its
+# samples to files in that directory and /metrics aggregates all of them.
+# The directory must be emptied before the workers start.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "readre_http_request_duration_seconds", "Time to the end of the response body, by handler",
+    ["method", "handler"], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter(
+    "readre_http_requests_total", "Finished requests by handler and status code",
+    ["method", "handler", "status"]
+)
+IN_PROGRESS = Gauge(
+    "readre_http_requests_in_progress", "Requests being handled right now",
+    ["method"], multiprocess_mode="livesum"
+)
+
+POOL_CONNECTIONS = Gauge(
+    "readre_db_pool_connections", "Pooled database connections by state",
+    ["engine", "state"], multiprocess_mode="livesum"
+)
+POOL_TIMEOUTS = Counter(
+    "readre_db_pool_timeouts_total", "Checkouts that gave up after pool_timeout",
+    ["engine"]
+)
+REPLICA_UP = Gauge(
+    "readre_db_replica_up", "1 while a read replica is in rotation, 0 while it is skipped",
+    ["replica"], multiprocess_mode="livemin"
+)
+
+CACHE_LOOKUPS = Counter(
+    "readre_cache_lookups_total", "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+LIKE_BUFFER = Counter(
+    "readre_like_buffer_events_total", "Write-behind like buffer activity",
+    ["event"]
+)
+
+OUTBOUND_LATENCY = Histogram(
+    "readre_outbound_request_duration_seconds", "Calls to external services",
+    ["service", "operation"], buckets=LATENCY_BUCKETS
+)
+OUTBOUND_ERRORS = Counter(
+    "readre_outbound_errors_total", "Calls to external services that raised",
+    ["service", "operation"]
+)
+
+# (cache, result, stats key) read from each component's own stats() counters
+_CACHE_SOURCES = {
+    "response_cache": (("response", "hit", "hits"), ("response", "miss", "misses")),
+    "auth_cache": (
+        ("auth_token", "hit", "token_hits"), ("auth_token", "miss", "token_misses"),
+        ("auth_user", "hit", "user_hits"), ("auth_user", "miss", "user_misses"),
+    ),
+}
+_LIKE_BUFFER_KEYS = ("toggles", "coalesced", "flushes", "rows_written", "flush_failures")
+
+_synced: Dict[tuple, float] = {}
+
+
+@contextmanager
+def observe_outbound(service: str, operation: str) -> Iterator[None]:
+    """Time one call to an external service, counting it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        OUTBOUND_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        OUTBOUND_LATENCY.labels(service, operation).observe(time.perf_counter() - started)
+
+
+class _Metered:
+    """Pool mixin keeping the pool gauges exact and counting checkout timeouts.
+
+    Gauges are updated after each checkout and return, when the pool's own
+    counts are settled, so scrapes never call into the pool.
+    """
+    engine_label = ""
+
+    def _do_get(self):
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.labels(self.engine_label).inc()
+            raise
+        self._update_gauges()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self):
+        POOL_CONNECTIONS.labels(self.engine_label, "checked_out").set(self.checkedout())
+        POOL_CONNECTIONS.labels(self.engine_label, "idle").set(self.checkedin())
+        # overflow() starts at -pool_size; only connections beyond the pool count
+        POOL_CONNECTIONS.labels(self.engine_label, "overflow").set(max(self.overflow(), 0))
+
+
+class MeteredQueuePool(_Metered, QueuePool):
+    engine_label = "sync"
+
+
+class MeteredAsyncAdaptedQueuePool(_Metered, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def _advance(counter: Counter, labels: Tuple[str, ...], total: float) -> None:
+    # Components keep plain cumulative ints; turn them into counter increments
+    # so per-worker values add up across processes
+    key = (id(counter), *labels)
+    delta = total - _synced.get(key, 0)
+    if delta > 0:
+        counter.labels(*labels).inc(delta)
+    _synced[key] = total
+
+
+def sync_component_stats() -> None:
+    """Copy the caches' and like buffer's counters into the metrics."""
+    from core.services.likes import like_buffer
+    from core.utils.auth_cache import auth_cache
+    from core.utils.cache import response_cache
+
+    sources = {"response_cache": response_cache.stats(), "auth_cache": auth_cache.stats()}
+    for name, stats in sources.items():
+        for cache, result, key in _CACHE_SOURCES[name]:
+            _advance(CACHE_LOOKUPS, (cache, result), stats[key])
+    buffer_stats = like_buffer.stats()
+    for key in _LIKE_BUFFER_KEYS:
+        _advance(LIKE_BUFFER, (key,), buffer_stats[key])
+
+
+def render_metrics() -> bytes:
+    sync_component_stats()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges; call when the worker shuts down."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Per-handler latency, status counts and in-flight requests.
+
+    The handler label is the endpoint function's name, so path parameters
+    never multiply the series; unrouted requests are labelled `unmatched`.
+    Component counters are copied at most every `sync_seconds`, keeping the
+    hot path to a few metric updates.
+    """
+
+    def __init__(self, app: ASGIApp, sync_seconds: float = 5.0):
+        self.app = app
+        self.sync_seconds = sync_seconds
+        self._next_sync = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            handler = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            REQUEST_LATENCY.labels(method, handler).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, handler, str(status_code)).inc()
+            if started >= self._next_sync:
+                self._next_sync = started + self.sync_seconds
+                sync_component_stats()
@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(date_added: datetime, row_id: int) -> str:
+    """Encode a `(date_added, id)` keyset position as an opaque token."""
+    raw = json.dumps([date_added.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by `encode_cursor`.
+
+    Raises `ValueError` when the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_added, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_added), int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode a plain offset for result sets without a stable keyset, such as relevance-ranked search."""
+    raw = json.dumps({"offset": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Decode a token produced by `encode_offset_cursor`.
+
+    Raises `ValueError` when the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded))["offset"])
+    except (TypeError, KeyError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
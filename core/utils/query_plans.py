@@ -0,0 +1,164 @@
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Tables whose full scans the hot paths must never need
+CHECKED_TABLES = ("blogs", "comments", "likes", "users", "uploads")
+
+# SQLite reports a full walk as "SCAN <table>", optionally "USING [COVERING] INDEX <name>"
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+class PlanReport(NamedTuple):
+    scenario: str
+    statement: str
+    plan: List[str]
+    full_scans: List[str]
+
+
+@contextmanager
+def captured_statements(connection: Connection) -> Iterator[List[Tuple[str, object]]]:
+    """Record every statement (and its parameters) run on `connection`."""
+    statements: List[Tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+
+
+def explain(connection: Connection, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    """Return (plan lines, tables read by full scan) for one statement.
+
+    Walking a whole index in order is as bad as a table scan unless a LIMIT
+    stops it early, as in the newest-first listings, so it counts too.
+    """
+    limited = bool(_LIMIT.search(statement))
+    if connection.dialect.name == "postgresql":
+        row = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        plans = row if isinstance(row, list) else json.loads(row)
+        lines, scans = [], []
+
+        def walk(node, depth=0):
+            relation = node.get("Relation Name")
+            lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+            full_walk = node["Node Type"] in ("Index Scan", "Index Only Scan") and "Index Cond" not in node
+            if relation in CHECKED_TABLES and (node["Node Type"] == "Seq Scan" or (full_walk and not limited)):
+                scans.append(relation)
+            for child in node.get("Plans", ()):
+                walk(child, depth + 1)
+
+        for plan in plans:
+            walk(plan["Plan"])
+        return lines, scans
+
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    lines = [row[-1] for row in rows]
+    scans = []
+    for line in lines:
+        match = _SQLITE_SCAN.match(line)
+        if match and match.group(1) in CHECKED_TABLES and not (match.group(2) and limited):
+            scans.append(match.group(1))
+    return lines, scans
+
+
+def hot_path_scenarios(db: Session) -> Dict[str, Callable[[Session], object]]:
+    """Seed a small fixture and return the hot read and write paths over it.
+
+    Each scenario calls the same service function its route uses, so a query
+    changed there is checked here without editing this list.
+    """
+    from core.models.blogs import Blog, Comment, Like
+    from core.models.uploads import Upload
+    from core.models.users import User
+    from core.routes.auth import load_user_by_email
+    from core.services.blogs import load_blog_detail, load_blog_page, load_blog_stamp, load_comment_page, load_user_blogs
+    from core.services.likes import load_like_state, toggle_like
+    from core.services.search import search_blogs
+    from core.services.uploads import adjust_upload_refs, find_upload_url
+
+    now = datetime.utcnow()
+    users = [User(email=f"plan-{n}@example.com", name=f"Plan User {n}") for n in range(3)]
+    db.add_all(users)
+    db.flush()
+    blogs = [
+        Blog(title=f"Query plan fixture {n}", description="indexed words " * 50, tag="test",
+             image=f"https://example.com/plan-fixture-{n}.png", user_id=users[n % 3].id, date_added=now)
+        for n in range(6)
+    ]
+    db.add_all(blogs)
+    db.flush()
+    comments = [
+        Comment(text="A comment", blog_id=blog.id, user_id=users[0].id, author=users[0].username, date_added=now)
+        for blog in blogs for _ in range(3)
+    ]
+    db.add_all(comments)
+    db.add(Upload(sha256="0" * 64, key="plan-fixture-0.png", url="https://example.com/plan-fixture-0.png", content_type="image/png", size=1))
+    db.flush()
+    db.add_all([Like(user_id=users[1].id, blog_id=blogs[0].id), Like(user_id=users[1].id, comment_id=comments[0].id)])
+    db.flush()
+
+    user, blog, comment = users[1], blogs[0], comments[0]
+    return {
+        "blog_page": lambda db: load_blog_page(db, 0, 10),
+        "blog_page_cursor": lambda db: load_blog_page(db, 0, 10, (now, blog.id)),
+        "blog_detail": lambda db: load_blog_detail(db, blog.slug),
+        "blog_stamp": lambda db: load_blog_stamp(db, blog.slug),
+        "comment_page": lambda db: load_comment_page(db, blog.id, 10),
+        "comment_page_cursor": lambda db: load_comment_page(db, blog.id, 10, (now, comment.id)),
+        "user_blogs": lambda db: load_user_blogs(db, user.id),
+        "like_state_blog": lambda db: load_like_state(db, user.id, blog.slug),
+        "like_state_comment": lambda db: load_like_state(db, user.id, blog.slug, comment.id),
+        "toggle_like_blog": lambda db: toggle_like(db, user.id, Like.blog_id, blog.id, blog.id),
+        "toggle_like_comment": lambda db: toggle_like(db, user.id, Like.comment_id, comment.id, blog.id),
+        "delete_comment": lambda db: db.delete(comments[-1]),
+        "user_by_email": lambda db: load_user_by_email(db, user.email),
+        "upload_by_hash": lambda db: find_upload_url(db, "0" * 64),
+        "upload_refs": lambda db: adjust_upload_refs(db, blog.image, 1),
+        "search": lambda db: search_blogs(db, "indexed"),
+    }
+
+
+def check_query_plans(
+    connection: Connection,
+    build_scenarios: Callable[[Session], Dict[str, Callable[[Session], object]]] = hot_path_scenarios
+) -> List[PlanReport]:
+    """Seed through `build_scenarios`, run each scenario, then EXPLAIN every
+    statement it issued.
+
+    Everything happens inside one transaction that is rolled back, so the
+    fixture and the write scenarios leave nothing behind, even against a shared database.
+    On PostgreSQL sequential scans are disabled for the check, so one shows
+    up only where no index can answer the query at all; otherwise tiny
+    fixture tables would make the planner prefer them anyway.
+    """
+    reports = []
+    transaction = connection.begin()
+    try:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        scenarios = build_scenarios(db)
+        for name, scenario in scenarios.items():
+            with captured_statements(connection) as statements:
+                scenario(db)
+                db.flush()
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+                    continue
+                plan, scans = explain(connection, statement, parameters)
+                reports.append(PlanReport(name, statement, plan, scans))
+    finally:
+        transaction.rollback()
+    return reports
@@ -0,0 +1,179 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("readre.requests")
+
+# Most statements one request of each handler may issue, with cold caches.
+# Routes whose work grows with the request body (imports, exports) have none.
+QUERY_BUDGETS: Dict[str, int] = {
+    "get_blogs": 2,
+    # Blog and comments; a revalidation with a stale ETag reads the stamp first
+    "get_blog": 3,
+    "get_user_blogs": 2,
+    "get_comments": 3,
+    "get_like_status": 2,
+    "get_current_user_info": 1,
+    "google_auth": 3,
+    "refresh_token": 3,
+    "logout": 0,
+    "upload_image": 2,
+    "get_image_variant": 0,
+    "create_blog": 5,
+    "update_blog": 5,
+    "delete_blog": 6,
+    "create_comment": 5,
+    "update_comment": 7,
+    "delete_comment": 6,
+    "like_blog": 5,
+    "like_comment": 6,
+}
+
+
+class QueryStats:
+    """Statements and database time of one unit of work, usually a request."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self, record: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[str]] = [] if record else None
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries", '
+            f"app;dur={total_seconds * 1000:.2f}"
+        )
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, limit: int, stats: QueryStats):
+        listing = "".join(f"\n  {' '.join(s.split())}" for s in stats.statements or ())
+        super().__init__(f"{stats.count} queries issued, budget is {limit}:{listing}")
+        self.limit = limit
+        self.stats = stats
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - started
+    if stats.statements is not None:
+        stats.statements.append(statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute statements on `engine` to whatever `track_queries` is active.
+
+    The ContextVar follows requests into the threadpool and into
+    `AsyncSession.run_sync`, so sync and asyncio sessions are both counted.
+    Statements outside any tracked scope cost one ContextVar lookup.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(record: bool = False) -> Iterator[QueryStats]:
+    """Count the statements issued in this context; `record` keeps their SQL."""
+    stats = QueryStats(record)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(limit: int) -> Iterator[QueryStats]:
+    """Fail with `QueryBudgetExceeded` when the block issues more than `limit` statements.
+
+        with query_budget(QUERY_BUDGETS["get_blog"]):
+            load_blog_detail(db, slug)
+    """
+    with track_queries(record=True) as stats:
+        yield stats
+    if stats.count > limit:
+        raise QueryBudgetExceeded(limit, stats)
+
+
+def assert_query_budget(handler: str, query_count: int) -> None:
+    """Check a response's `X-Query-Count` against the handler's budget."""
+    limit = QUERY_BUDGETS.get(handler)
+    if limit is not None and query_count > limit:
+        raise AssertionError(f"{handler} issued {query_count} queries, budget is {limit}")
+
+
+class RequestTimingMiddleware:
+    """Count statements and DB time per request.
+
+    Adds `Server-Timing` and `X-Query-Count` headers and logs one JSON line
+    per request to the `readre.requests` logger, at WARNING when the handler
+    went over its `QUERY_BUDGETS` entry. Headers are sent before a streamed
+    body, so for streaming routes only the log line has the final numbers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+                headers.append("X-Query-Count", str(stats.count))
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self.log(scope, status_code, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def log(scope: Scope, status_code: int, stats: QueryStats, total_seconds: float) -> None:
+        handler = getattr(scope.get("endpoint"), "__name__", None)
+        limit = QUERY_BUDGETS.get(handler)
+        over_budget = limit is not None and stats.count > limit
+        level = logging.WARNING if over_budget else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            "method": scope["method"],
+            "path": scope["path"],
+            "handler": handler,
+            "status": status_code,
+            "queries": stats.count,
+            "db_ms": round(stats.seconds * 1000, 2),
+            "total_ms": round(total_seconds * 1000, 2),
+            "over_budget": over_budget,
+        }))
@@ -0,0 +1,19 @@
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """Cut `text` to at most `length` characters on a word boundary."""
+    text = " ".join((text or "").split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def count_words(text: str) -> int:
+    return len((text or "").split())
+
+
+def reading_time(word_count: int, words_per_minute: int) -> int:
+    """Estimated minutes needed to read `word_count` words, rounded up."""
+    return -(-word_count // words_per_minute)
@@ -0,0 +1,113 @@
+import hashlib
+from typing import AsyncIterator, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+# (magic prefix, content type, extension)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"GIF87a", "image/gif", "gif"),
+    (b"GIF89a", "image/gif", "gif"),
+)
+
+IMAGE_EXTENSIONS = ("jpg", "png", "gif", "webp")
+
+SNIFF_BYTES = 12
+
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class UploadInfo(NamedTuple):
+    content_type: str
+    extension: str
+    size: int
+    sha256: str
+
+
+def sniff_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """Return (content type, extension) from an image's leading bytes."""
+    for magic, content_type, extension in IMAGE_SIGNATURES:
+        if head.startswith(magic):
+            return content_type, extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return None
+
+
+class UploadTooLarge(MultiPartException):
+    # A MultiPartException, so the parser closes the files it already
+    # spooled before the error reaches the route
+    pass
+
+
+def check_content_length(request: Request, max_bytes: int) -> None:
+    """Reject a declared oversize body before any of it is parsed."""
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {max_bytes} bytes"
+        )
+
+
+async def limited_stream(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    """The request body, failing as soon as more than `max_bytes` arrived."""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        yield chunk
+
+
+async def parse_upload_form(request: Request, max_bytes: int, max_files: int = 1, max_fields: int = 1) -> FormData:
+    """Parse a multipart upload whose file may be at most `max_bytes`.
+
+    The body is counted while it streams in, so chunked requests and ones
+    without a Content-Length stop at the limit instead of being spooled to
+    disk in full first. Non-multipart bodies give an empty form.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        return FormData()
+    stream = limited_stream(request, max_bytes + MULTIPART_OVERHEAD_BYTES)
+    parser = MultiPartParser(request.headers, stream, max_files=max_files, max_fields=max_fields)
+    try:
+        return await parser.parse()
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {max_bytes} bytes"
+        )
+    except MultiPartException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+
+async def inspect_upload(file: UploadFile, max_bytes: int, chunk_size: int) -> UploadInfo:
+    """Read `file` in chunks, enforcing `max_bytes`, sniffing and hashing it.
+
+    The client-declared content type is ignored. The file is left rewound
+    for the storage backend.
+    """
+    head = await file.read(SNIFF_BYTES)
+    sniffed = sniff_image_type(head)
+    if sniffed is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only JPEG, PNG, GIF and WebP images are accepted"
+        )
+
+    size = len(head)
+    digest = hashlib.sha256(head)
+    while chunk := await file.read(chunk_size):
+        size += len(chunk)
+        digest.update(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload exceeds {max_bytes} bytes"
+            )
+    await file.seek(0)
+    return UploadInfo(sniffed[0], sniffed[1], size, digest.hexdigest())
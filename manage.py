@@ -0,0 +1,160 @@
+from datetime import datetime
+from typing import Optional
+
+import typer
+
+from core.db import SessionLocal
+
+cli = typer.Typer(help="Maintenance commands for the Readre blog API")
+
+
+@cli.callback()
+def main():
+    """Maintenance commands for the Readre blog API."""
+
+
+@cli.command()
+def repair_counters():
+    """Reconcile the denormalized like and comment counters with the source rows."""
+    from core.services.blogs import repair_counters as repair
+
+    db = SessionLocal()
+    try:
+        repaired = repair(db)
+        db.commit()
+    finally:
+        db.close()
+    typer.echo(f"Repaired {repaired['blogs']} blog(s) and {repaired['comments']} comment(s)")
+
+
+@cli.command()
+def refresh_reading_time():
+    """Recompute stored reading times after changing READING_SPEED_WPM."""
+    from core.config.settings import settings
+    from core.services.blogs import refresh_reading_time as refresh
+
+    db = SessionLocal()
+    try:
+        changed = refresh(db, settings.READING_SPEED_WPM)
+        db.commit()
+    finally:
+        db.close()
+    typer.echo(f"Updated the reading time of {changed} blog(s)")
+
+
+@cli.command()
+def gc_uploads(
+    grace_hours: Optional[int] = typer.Option(None, help="Keep unreferenced uploads younger than this (default: UPLOAD_GC_GRACE_HOURS)")
+):
+    """Delete uploaded media that no blog references any more."""
+    from datetime import timedelta
+    from core.config.settings import settings
+    from core.services.storage import storage
+    from core.services.uploads import collect_unused_uploads
+
+    if grace_hours is None:
+        grace_hours = settings.UPLOAD_GC_GRACE_HOURS
+    db = SessionLocal()
+    try:
+        deleted = collect_unused_uploads(db, storage, timedelta(hours=grace_hours))
+    finally:
+        db.close()
+    typer.echo(f"Deleted {deleted} unused upload(s)")
+
+
+@cli.command()
+def import_blogs(
+    path: str = typer.Argument(..., help="NDJSON file with one BlogCreate object per line, or - for stdin"),
+    author: str = typer.Option(..., help="Email of the user the blogs are attributed to"),
+    batch_size: Optional[int] = typer.Option(None, help="Rows per INSERT batch (default: IMPORT_BATCH_SIZE)")
+):
+    """Bulk-import blogs from newline-delimited JSON."""
+    import sys
+    from core.models.users import User
+    from core.services.imports import BlogImporter
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == author).first()
+        if user is None:
+            typer.echo(f"No user with email {author}", err=True)
+            raise typer.Exit(code=1)
+
+        importer = BlogImporter(user.id, batch_size)
+        source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line_no, line in enumerate(source, start=1):
+                if importer.feed(line_no, line):
+                    importer.flush(db)
+            importer.flush(db)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    finally:
+        db.close()
+
+    report = importer.report
+    for error in report.errors:
+        typer.echo(f"line {error.line}: {error.detail}", err=True)
+    typer.echo(f"Imported {report.imported} blog(s), {report.failed} line(s) failed")
+
+
+@cli.command()
+def export(
+    table: str = typer.Argument(..., help="blogs, comments or likes"),
+    output: str = typer.Option("-", help="File to write, or - for stdout"),
+    format: str = typer.Option("ndjson", help="ndjson or csv"),
+    since: Optional[datetime] = typer.Option(None, help="Only rows changed at or after this time"),
+    gzip: bool = typer.Option(False, help="Gzip the output")
+):
+    """Stream a table to NDJSON or CSV without loading it into memory."""
+    import sys
+    from core.config.settings import settings
+    from core.services.exports import EXPORT_FORMATS, EXPORT_TABLES, is_incremental, iter_export, next_watermark
+
+    if table not in EXPORT_TABLES or format not in EXPORT_FORMATS:
+        typer.echo(f"Unknown table or format: {table} / {format}", err=True)
+        raise typer.Exit(code=1)
+
+    watermark = next_watermark()
+    target = sys.stdout.buffer if output == "-" else open(output, "wb")
+    try:
+        for chunk in iter_export(table, format, since, compress=gzip, batch_size=settings.EXPORT_BATCH_SIZE):
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+    mode = "Incremental" if is_incremental(table, since) else "Full"
+    typer.echo(f"{mode} export; deletions are only reflected by full exports", err=True)
+    typer.echo(f"Watermark for the next incremental export: {watermark.isoformat()}", err=True)
+
+
+@cli.command()
+def check_query_plans(verbose: bool = typer.Option(False, help="Print every plan, not only regressions")):
+    """EXPLAIN the hot-path queries against seeded rows; exit 1 on a full table scan.
+
+    The fixture is written inside a transaction that is rolled back, so this
+    is safe to run against any migrated database, including CI's PostgreSQL.
+    """
+    from core.db import engine
+    from core.utils.query_plans import check_query_plans as check
+
+    with engine.connect() as connection:
+        reports = check(connection)
+
+    failures = 0
+    for report in reports:
+        if report.full_scans:
+            failures += 1
+        if report.full_scans or verbose:
+            label = "FULL SCAN of " + ", ".join(report.full_scans) if report.full_scans else "ok"
+            typer.echo(f"[{report.scenario}] {label}\n  {' '.join(report.statement.split())}")
+            for line in report.plan:
+                typer.echo(f"    {line}")
+    typer.echo(f"Checked {len(reports)} statement(s); {failures} with a full table scan")
+    if failures:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -5,6 +5,7 @@ from alembic import context
 from core.config.settings import settings
 from core.models import *  # Import all your models
 from core.db import Base
+from core.models.search import is_search_object
 
 
 # this is the Alembic Config object
@@ -19,6 +20,11 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata  # This should be your SQLAlchemy Base
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # The full-text search index is raw DDL (core/models/search.py); without
+    # this, autogenerate would emit drops for it
+    return not is_search_object(name, type_)
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -26,6 +32,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -41,7 +48,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection, 
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,42 @@
+"""add uploads table
+
+Revision ID: 0b7e4a9d2c15
+Revises: f62d8b4c07e1
+Create Date: 2026-10-17 18:02:31.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4a9d2c15'
+down_revision: Union[str, None] = 'f62d8b4c07e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('content_type', sa.String(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('date_added', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uploads_id'), 'uploads', ['id'], unique=False)
+    op.create_index(op.f('ix_uploads_sha256'), 'uploads', ['sha256'], unique=True)
+    op.create_index(op.f('ix_uploads_url'), 'uploads', ['url'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_uploads_url'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_sha256'), table_name='uploads')
+    op.drop_index(op.f('ix_uploads_id'), table_name='uploads')
+    op.drop_table('uploads')
@@ -0,0 +1,46 @@
+"""add unique like indexes
+
+Revision ID: 1c6f0e8b5a27
+Revises: 0b7e4a9d2c15
+Create Date: 2026-10-17 20:36:12.845203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c6f0e8b5a27'
+down_revision: Union[str, None] = '0b7e4a9d2c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop the duplicates earlier races left behind, keeping the oldest like
+    for column in ('blog_id', 'comment_id'):
+        op.execute(
+            f"DELETE FROM likes WHERE {column} IS NOT NULL AND id NOT IN ("
+            f"SELECT min(id) FROM likes WHERE {column} IS NOT NULL GROUP BY user_id, {column})"
+        )
+
+    op.create_index(
+        'uq_likes_user_blog', 'likes', ['user_id', 'blog_id'], unique=True,
+        postgresql_where=sa.text('blog_id IS NOT NULL'), sqlite_where=sa.text('blog_id IS NOT NULL')
+    )
+    op.create_index(
+        'uq_likes_user_comment', 'likes', ['user_id', 'comment_id'], unique=True,
+        postgresql_where=sa.text('comment_id IS NOT NULL'), sqlite_where=sa.text('comment_id IS NOT NULL')
+    )
+
+    # The duplicates were counted too
+    for table, column in (('blogs', 'blog_id'), ('comments', 'comment_id')):
+        count = f"(SELECT count(*) FROM likes WHERE likes.{column} = {table}.id)"
+        op.execute(f"UPDATE {table} SET likes_count = {count} WHERE likes_count != {count}")
+
+
+def downgrade() -> None:
+    op.drop_index('uq_likes_user_comment', table_name='likes')
+    op.drop_index('uq_likes_user_blog', table_name='likes')
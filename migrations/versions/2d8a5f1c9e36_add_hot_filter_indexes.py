@@ -0,0 +1,44 @@
+"""add hot filter indexes
+
+Revision ID: 2d8a5f1c9e36
+Revises: 1c6f0e8b5a27
+Create Date: 2026-10-17 21:14:52.307416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8a5f1c9e36'
+down_revision: Union[str, None] = '1c6f0e8b5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('ix_comments_blog_id_date_added_id', 'comments', ['blog_id', 'date_added', 'id'], None),
+    ('ix_blogs_user_id_date_added_id', 'blogs', ['user_id', 'date_added', 'id'], None),
+    ('ix_likes_blog_id', 'likes', ['blog_id'], 'blog_id IS NOT NULL'),
+    ('ix_likes_comment_id', 'likes', ['comment_id'], 'comment_id IS NOT NULL'),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, and keeps PostgreSQL
+    # accepting writes to these tables while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            predicate = sa.text(where) if where else None
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True,
+                postgresql_where=predicate, sqlite_where=predicate
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
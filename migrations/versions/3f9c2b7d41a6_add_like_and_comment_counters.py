@@ -0,0 +1,45 @@
+"""add like and comment counters
+
+Revision ID: 3f9c2b7d41a6
+Revises: 889f4943386d
+Create Date: 2026-10-17 09:12:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d41a6'
+down_revision: Union[str, None] = '889f4943386d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing rows
+    op.execute(
+        "UPDATE blogs SET "
+        "likes_count = (SELECT count(*) FROM likes WHERE likes.blog_id = blogs.id), "
+        "comments_count = (SELECT count(*) FROM comments WHERE comments.blog_id = blogs.id)"
+    )
+    op.execute(
+        "UPDATE comments SET "
+        "likes_count = (SELECT count(*) FROM likes WHERE likes.comment_id = comments.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.drop_column('likes_count')
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('comments_count')
+        batch_op.drop_column('likes_count')
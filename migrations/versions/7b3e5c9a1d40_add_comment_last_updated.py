@@ -0,0 +1,29 @@
+"""add comment last updated
+
+Revision ID: 7b3e5c9a1d40
+Revises: 2d8a5f1c9e36
+Create Date: 2026-10-17 22:05:38.164203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e5c9a1d40'
+down_revision: Union[str, None] = '2d8a5f1c9e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('date_last_updated', sa.DateTime(), nullable=True))
+    op.execute("UPDATE comments SET date_last_updated = date_added")
+    op.create_index('ix_comments_date_last_updated', 'comments', ['date_last_updated'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_date_last_updated', table_name='comments')
+    op.drop_column('comments', 'date_last_updated')
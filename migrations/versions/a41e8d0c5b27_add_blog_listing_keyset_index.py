@@ -0,0 +1,25 @@
+"""add blog listing keyset index
+
+Revision ID: a41e8d0c5b27
+Revises: 3f9c2b7d41a6
+Create Date: 2026-10-17 10:03:17.402981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e8d0c5b27'
+down_revision: Union[str, None] = '3f9c2b7d41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_blogs_date_added_id', 'blogs', ['date_added', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blogs_date_added_id', table_name='blogs')
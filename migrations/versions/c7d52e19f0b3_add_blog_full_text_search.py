@@ -0,0 +1,68 @@
+"""add blog full text search
+
+Revision ID: c7d52e19f0b3
+Revises: a41e8d0c5b27
+Create Date: 2026-10-17 11:26:54.730114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d52e19f0b3'
+down_revision: Union[str, None] = 'a41e8d0c5b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # The generated column is computed for existing rows as it is added
+        op.execute(
+            "ALTER TABLE blogs ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_blogs_search_vector ON blogs USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE blogs_fts USING fts5("
+            "title, description, content='blogs', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER blogs_fts_ai AFTER INSERT ON blogs BEGIN "
+            "INSERT INTO blogs_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER blogs_fts_ad AFTER DELETE ON blogs BEGIN "
+            "INSERT INTO blogs_fts(blogs_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER blogs_fts_au AFTER UPDATE OF title, description ON blogs BEGIN "
+            "INSERT INTO blogs_fts(blogs_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO blogs_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO blogs_fts(blogs_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_blogs_search_vector")
+        op.execute("ALTER TABLE blogs DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS blogs_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS blogs_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS blogs_fts_ai")
+        op.execute("DROP TABLE IF EXISTS blogs_fts")
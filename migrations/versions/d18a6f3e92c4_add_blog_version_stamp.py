@@ -0,0 +1,32 @@
+"""add blog version stamp
+
+Revision ID: d18a6f3e92c4
+Revises: c7d52e19f0b3
+Create Date: 2026-10-17 12:41:09.285671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd18a6f3e92c4'
+down_revision: Union[str, None] = 'c7d52e19f0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ALTERs rather than batch mode: recreating the table on SQLite
+    # would drop the full-text search triggers attached to it
+    op.add_column('blogs', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('blogs', sa.Column('date_last_updated', sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE blogs SET date_last_updated = date_added")
+
+
+def downgrade() -> None:
+    op.drop_column('blogs', 'date_last_updated')
+    op.drop_column('blogs', 'version')
@@ -0,0 +1,76 @@
+"""add blog excerpt and reading time
+
+Revision ID: e5b09c7a13d8
+Revises: d18a6f3e92c4
+Create Date: 2026-10-17 14:05:33.619402
+
+"""
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b09c7a13d8'
+down_revision: Union[str, None] = 'd18a6f3e92c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+EXCERPT_LENGTH = 200
+AVERAGE_READING_SPEED = 200
+
+blogs = sa.table(
+    'blogs',
+    sa.column('id', sa.Integer),
+    sa.column('description', sa.Text),
+    sa.column('excerpt', sa.String),
+    sa.column('reading_time', sa.Integer),
+)
+
+
+def _excerpt(text):
+    text = " ".join((text or "").split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text[:EXCERPT_LENGTH].rsplit(" ", 1)[0] or text[:EXCERPT_LENGTH]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def upgrade() -> None:
+    # Plain ALTERs keep the SQLite full-text search triggers in place
+    op.add_column('blogs', sa.Column('excerpt', sa.String(), nullable=True))
+    op.add_column('blogs', sa.Column('reading_time', sa.Integer(), server_default='0', nullable=False))
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(blogs.c.id, blogs.c.description)
+            .where(blogs.c.id > last_id)
+            .order_by(blogs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            blogs.update()
+            .where(blogs.c.id == sa.bindparam('row_id'))
+            .values(excerpt=sa.bindparam('new_excerpt'), reading_time=sa.bindparam('new_reading_time')),
+            [
+                {
+                    'row_id': row.id,
+                    'new_excerpt': _excerpt(row.description),
+                    'new_reading_time': math.ceil(len((row.description or "").split()) / AVERAGE_READING_SPEED),
+                }
+                for row in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column('blogs', 'reading_time')
+    op.drop_column('blogs', 'excerpt')
@@ -0,0 +1,67 @@
+"""add blog word count
+
+Revision ID: f62d8b4c07e1
+Revises: e5b09c7a13d8
+Create Date: 2026-10-17 15:18:47.052316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f62d8b4c07e1'
+down_revision: Union[str, None] = 'e5b09c7a13d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+blogs = sa.table(
+    'blogs',
+    sa.column('id', sa.Integer),
+    sa.column('description', sa.Text),
+    sa.column('word_count', sa.Integer),
+    sa.column('reading_time', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    # Plain ALTER keeps the SQLite full-text search triggers in place
+    op.add_column('blogs', sa.Column('word_count', sa.Integer(), server_default='0', nullable=False))
+
+    words_per_minute = settings.READING_SPEED_WPM
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(blogs.c.id, blogs.c.description)
+            .where(blogs.c.id > last_id)
+            .order_by(blogs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            word_count = len((row.description or "").split())
+            params.append({
+                'row_id': row.id,
+                'new_word_count': word_count,
+                'new_reading_time': -(-word_count // words_per_minute),
+            })
+        bind.execute(
+            blogs.update()
+            .where(blogs.c.id == sa.bindparam('row_id'))
+            .values(word_count=sa.bindparam('new_word_count'), reading_time=sa.bindparam('new_reading_time')),
+            params
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column('blogs', 'word_count')
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+# Settings and engines are built at import time, so the environment comes first
+_workdir = tempfile.mkdtemp(prefix="readre-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["MEDIA_BACKEND"] = "local"
+os.environ["MEDIA_ROOT"] = os.path.join(_workdir, "media")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+from app import app  # noqa: E402
+from core.db import Base, SessionLocal, engine  # noqa: E402
+from core.models.blogs import Blog  # noqa: E402
+from core.models.users import User  # noqa: E402
+from core.routes.auth import create_access_token  # noqa: E402
+from core.utils.cache import response_cache  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    yield
+    response_cache.clear()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(delete(table))
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def author(db):
+    user = User(email="author@example.com", name="Author")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth(author):
+    return {"Authorization": f"Bearer {create_access_token({'sub': author.email})}"}
+
+
+@pytest.fixture
+def make_blog(db, author):
+    def make_blog(title="A post about testing things", **fields):
+        blog = Blog(title=title, description="Words about testing. " * 10, tag="TECHNOLOGY",
+                    image="https://example.com/a.png", user_id=author.id, **fields)
+        db.add(blog)
+        db.commit()
+        return blog
+
+    return make_blog
@@ -0,0 +1,22 @@
+from core.services.blogs import load_blog_page
+
+
+def test_limit_zero_is_rejected(client, make_blog):
+    make_blog()
+    for limit in (0, -1, 101):
+        assert client.get("/blogs", params={"limit": limit}).status_code == 422
+
+
+def test_limit_zero_page_is_empty(db, make_blog):
+    make_blog()
+    assert load_blog_page(db, 0, 0) == ([], None)
+
+
+def test_next_cursor_pages_through(client, make_blog):
+    for n in range(3):
+        make_blog(title=f"A post about testing number {n}")
+    first = client.get("/blogs", params={"limit": 2})
+    assert len(first.json()) == 2
+    rest = client.get("/blogs", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+    assert len(rest.json()) == 1
+    assert "x-next-cursor" not in rest.headers
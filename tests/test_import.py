@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+from core.config.settings import settings
+from core.services.imports import ImportTooLarge, aiter_lines
+
+
+def ndjson(count):
+    return "".join(
+        json.dumps({"title": f"Imported post number {n}", "description": "Imported words. " * 10,
+                    "tag": "TECHNOLOGY", "image": "https://example.com/a.png"}) + "\n"
+        for n in range(count)
+    ).encode()
+
+
+def chunked(body, size=256):
+    # A generator body is sent chunked, without a Content-Length
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def collect(chunks, **limits):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    return [line async for line in aiter_lines(stream(), **limits)]
+
+
+def test_import_within_limits(client, auth):
+    response = client.post("/blogs/import", headers=auth, content=ndjson(3))
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+
+
+def test_import_rejects_declared_oversize_body(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 100)
+    assert client.post("/blogs/import", headers=auth, content=ndjson(3)).status_code == 413
+
+
+def test_import_rejects_oversize_streamed_body(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 300)
+    assert client.post("/blogs/import", headers=auth, content=chunked(ndjson(3))).status_code == 413
+
+
+def test_import_rejects_long_line(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_LINE_BYTES", 100)
+    assert client.post("/blogs/import", headers=auth, content=chunked(ndjson(3))).status_code == 413
+
+
+def test_long_line_fails_before_it_is_complete():
+    # No newline ever arrives; the partial line alone trips the limit
+    with pytest.raises(ImportTooLarge, match="Line 2"):
+        asyncio.run(collect([b"{}\n", b"x" * 60, b"x" * 60], max_line_bytes=100))
+    assert asyncio.run(collect([b"a\nb", b"c\n"], max_line_bytes=2)) == [(1, b"a"), (2, b"bc")]
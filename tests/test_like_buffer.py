@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from core.config.settings import settings
+from core.services.likes import like_buffer
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_WRITE_BEHIND", True)
+    yield
+    asyncio.run(like_buffer.flush())
+
+
+def test_rename_between_toggle_and_flush(client, auth, make_blog, write_behind):
+    blog = make_blog()
+    assert client.post(f"/blogs/{blog.slug}/like", headers=auth).json() == {"liked": True, "likes_count": 1}
+
+    renamed = client.put(f"/blogs/{blog.slug}", headers=auth, json={
+        "title": "A renamed post about testing", "description": "Words about testing. " * 10,
+        "tag": "TECHNOLOGY", "image": "https://example.com/a.png"}).json()["slug"]
+    assert renamed != blog.slug
+
+    # Overlay: the pending like is found under the new slug
+    before = client.get(f"/blogs/{renamed}")
+    assert before.json()["likes_count"] == 1
+    assert client.get(f"/blogs/{renamed}").headers["x-cache"] == "HIT"
+
+    asyncio.run(like_buffer.flush())
+    assert like_buffer.counts_by_blog() == {}
+
+    # The flush dropped the renamed blog's cached response
+    after = client.get(f"/blogs/{renamed}")
+    assert after.headers["x-cache"] == "MISS"
+    assert after.json()["likes_count"] == 1
+    assert after.headers["etag"] != before.headers["etag"]
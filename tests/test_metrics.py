@@ -0,0 +1,20 @@
+from core.config.settings import settings
+
+
+def test_metrics_open_outside_production(client):
+    assert client.get("/metrics").status_code == 200
+
+
+def test_metrics_hidden_in_production_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "IS_PRODUCTION", True)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_token_required_in_production(client, monkeypatch):
+    monkeypatch.setattr(settings, "IS_PRODUCTION", True)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert b"# HELP" in response.content
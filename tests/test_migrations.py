@@ -0,0 +1,18 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from core.db import Base, engine
+from core.models.search import is_search_object
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Same filter as migrations/env.py
+    return not is_search_object(name, type_)
+
+
+def test_autogenerate_leaves_search_index_alone():
+    with engine.connect() as conn:
+        assert "blogs_fts" in engine.dialect.get_table_names(conn)
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) != []
+        context = MigrationContext.configure(conn, opts={"include_object": include_object})
+        assert compare_metadata(context, Base.metadata) == []
@@ -0,0 +1,31 @@
+from core.utils.cache import response_cache
+from core.utils.query_stats import assert_query_budget
+
+
+def query_count(response):
+    return int(response.headers["x-query-count"])
+
+
+def test_get_blog_within_budget(client, make_blog):
+    blog = make_blog()
+    response = client.get(f"/blogs/{blog.slug}")
+    assert response.status_code == 200
+    assert_query_budget("get_blog", query_count(response))
+
+
+def test_get_blog_stale_etag_within_budget(client, make_blog):
+    blog = make_blog()
+    etag = client.get(f"/blogs/{blog.slug}").headers["etag"]
+
+    # Current ETag: answered from the stamp alone
+    response_cache.clear()
+    fresh = client.get(f"/blogs/{blog.slug}", headers={"If-None-Match": etag})
+    assert fresh.status_code == 304
+    assert_query_budget("get_blog", query_count(fresh))
+
+    # Stale ETag: stamp lookup, then the full detail load
+    response_cache.clear()
+    stale = client.get(f"/blogs/{blog.slug}", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert query_count(stale) == 3
+    assert_query_budget("get_blog", query_count(stale))